@@ -188,6 +188,39 @@ import os
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# 115 report rendering
+# WeasyPrint resolves report asset links against this base URL; MEDIA_URL and
+# STATIC_URL paths under it are read straight from MEDIA_ROOT / STATIC_ROOT.
+REPORT_BASE_URL = 'http://localhost/'
+REPORT_ASSET_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 64 MB
+# Bump when the report logo, signature or fonts change, to invalidate cached PDFs
+REPORT_TEMPLATE_VERSION = '1'
+# Process pool size for bulk 115 rendering (1 = render in-process)
+REPORT_RENDER_WORKERS = int(os.getenv('REPORT_RENDER_WORKERS', os.cpu_count() or 1))
+# Hours a background bulk report PDF stays downloadable
+REPORT_JOB_ARTIFACT_TTL_HOURS = 24
+# 115 PDF output: embedded images are downsampled to this resolution and
+# recompressed; PDFs are linearized (fast first page) with pikepdf
+REPORT_PDF_IMAGE_DPI = 150
+REPORT_PDF_JPEG_QUALITY = 85
+REPORT_PDF_LINEARIZE = True
+# Recent report operations kept for the per-stage timing metrics
+REPORT_METRICS_MAX_SAMPLES = 1000
+
+# Survey exports: rows fetched per database round trip
+SURVEY_EXPORT_CHUNK_SIZE = 2000
+# Delta exports stop this far behind now, so rows saved by a transaction that
+# is still open are picked up by the next sync; longer than any import run
+SURVEY_DELTA_SAFETY_LAG_SECONDS = 300
+# Survey imports: rows read, checked and written per chunk; rows per bulk INSERT
+SURVEY_IMPORT_CHUNK_SIZE = 2000
+SURVEY_IMPORT_BATCH_SIZE = 1000
+
+# Connection photo derivatives (longest side in px, JPEG quality)
+SURVEY_PHOTO_REPORT_SIZE = 1200
+SURVEY_PHOTO_THUMBNAIL_SIZE = 320
+SURVEY_PHOTO_JPEG_QUALITY = 80
+
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'  
 EMAIL_PORT = 587
@@ -213,6 +246,17 @@ CELERY_WORKER_MAX_TASKS_PER_CHILD = 1000
  
 # If USE_CELERY is False, tasks run synchronously (no Redis needed)
 CELERY_TASK_ALWAYS_EAGER = not USE_CELERY
+
+# Re-render a survey's 115 PDF in the background after it is saved. Off when
+# Celery is not running, as eager tasks would render inside the request.
+REPORT_PREGENERATE_ON_SAVE = os.getenv('REPORT_PREGENERATE_ON_SAVE', str(USE_CELERY)).lower() == 'true'
+REPORT_PREGENERATE_DELAY_SECONDS = 30
+
+# Resize a survey's connection photo in the background after it is saved. Off
+# when Celery is not running, as eager tasks would resize inside the request;
+# run "manage.py build_photo_derivatives" instead. Reports use the original
+# photo until its derivatives are built.
+SURVEY_PHOTO_DERIVATIVES_ON_SAVE = os.getenv('SURVEY_PHOTO_DERIVATIVES_ON_SAVE', str(USE_CELERY)).lower() == 'true'
  
 # Production Redis URL (use environment variable)
 if os.getenv('REDIS_URL'):
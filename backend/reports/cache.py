@@ -0,0 +1,58 @@
+import hashlib
+import os
+from decimal import Decimal
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import models
+from django.template.loader import get_template
+
+# Templates whose source is part of the report version
+REPORT_TEMPLATE_NAMES = [
+    "report_115_template.html",
+    "report_115_page.html",
+    "report_115_styles.css",
+]
+
+# Survey fields that never change what the report shows
+NON_REPORT_FIELDS = {"pdfreport", "pdfreport_key", "updated_at"}
+
+
+@lru_cache(maxsize=1)
+def get_report_version():
+    """
+    Version of the 115 report layout: REPORT_TEMPLATE_VERSION plus a hash of
+    the template sources. Computed once per process, so template changes
+    take effect on deploy; bump REPORT_TEMPLATE_VERSION when the logo,
+    signature or fonts change.
+    """
+    digest = hashlib.sha256(str(settings.REPORT_TEMPLATE_VERSION).encode())
+    for template_name in REPORT_TEMPLATE_NAMES:
+        with open(get_template(template_name).origin.name, "rb") as template_file:
+            digest.update(template_file.read())
+    return digest.hexdigest()[:16]
+
+
+def _normalize(field, value):
+    # Unsaved instances can hold 0 where the database returns Decimal("0.00")
+    if value is not None and isinstance(field, models.DecimalField):
+        value = field.to_python(value).quantize(Decimal(1).scaleb(-field.decimal_places))
+    return value
+
+
+def compute_report_key(survey):
+    """Cache key for a survey's 115 PDF: its report field values + report version"""
+    digest = hashlib.sha256(get_report_version().encode())
+    for field in survey._meta.concrete_fields:
+        if field.name in NON_REPORT_FIELDS:
+            continue
+        value = _normalize(field, field.value_from_object(survey))
+        digest.update(f"{field.name}={value}\x1f".encode())
+    return digest.hexdigest()
+
+
+def is_report_fresh(survey):
+    """True when the stored PDF exists and was rendered from the current data"""
+    if not survey.pdfreport or not os.path.isfile(survey.pdfreport.path):
+        return False
+    return survey.pdfreport_key == compute_report_key(survey)
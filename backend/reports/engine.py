@@ -0,0 +1,139 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.template.loader import get_template, render_to_string
+from weasyprint import CSS, HTML
+from weasyprint.text.fonts import FontConfiguration
+from weasyprint.urls import URLFetchingError
+
+from .fetcher import local_url_fetcher, resolve_local_asset
+from .metrics import add_output, stage
+from .pdfopt import render_options
+
+logger = logging.getLogger(__name__)
+
+# Vendored subset of the Bootstrap rules the 115 templates use, so rendering
+# never needs network access
+BOOTSTRAP_CSS_PATH = "reports/bootstrap-115.css"
+
+
+# ==================== 115 REPORT ENGINE ====================
+class Report115Engine:
+    """
+    Long-lived renderer for report_115_template.html.
+
+    Holds the compiled Django template, the pre-parsed stylesheets and a
+    shared FontConfiguration, so the Devanagari @font-face rules and the CSS
+    are loaded once per process and each render only pays for layout and
+    PDF writing.
+    """
+
+    template_name = "report_115_template.html"
+    bulk_template_name = "report_115_bulk_template.html"
+    stylesheet_template_name = "report_115_styles.css"
+
+    def __init__(self):
+        self.font_config = FontConfiguration()
+        self.template = get_template(self.template_name)
+        self.bulk_template = get_template(self.bulk_template_name)
+        self.stylesheets = self.load_stylesheets()
+
+    def stylesheet_context(self):
+        """Asset URLs referenced by the report stylesheet"""
+        return {
+            "bootstrap_css_url": settings.STATIC_URL + BOOTSTRAP_CSS_PATH,
+            "regular_font_url": settings.STATIC_URL + "fonts/NotoSansDevanagari-Regular.ttf",
+            "bold_font_url": settings.STATIC_URL + "fonts/NotoSansDevanagari-Bold.ttf",
+        }
+
+    def load_stylesheets(self):
+        """Parse the report stylesheets once, registering fonts on font_config"""
+        stylesheets = []
+
+        try:
+            bootstrap_path = resolve_local_asset(settings.STATIC_URL + BOOTSTRAP_CSS_PATH)
+            stylesheets.append(
+                CSS(
+                    filename=bootstrap_path,
+                    url_fetcher=local_url_fetcher,
+                    font_config=self.font_config,
+                )
+            )
+        except URLFetchingError as e:
+            logger.warning(f"Bootstrap stylesheet not available for 115 reports: {e}")
+
+        report_css = render_to_string(self.stylesheet_template_name, self.stylesheet_context())
+        stylesheets.append(
+            CSS(
+                string=report_css,
+                base_url=settings.REPORT_BASE_URL,
+                url_fetcher=local_url_fetcher,
+                font_config=self.font_config,
+            )
+        )
+        return stylesheets
+
+    def _render_template(self, template, context, embed_styles):
+        # Styles are only inlined for standalone HTML output; PDF renders use
+        # the pre-parsed stylesheets instead
+        context = {**context, **self.stylesheet_context(), "embed_styles": embed_styles}
+        with stage("template"):
+            return template.render(context)
+
+    def render_html(self, context, embed_styles=False):
+        """Render one survey's report HTML"""
+        return self._render_template(self.template, context, embed_styles)
+
+    def render_bulk_html(self, page_contexts, embed_styles=False):
+        """Render many surveys as one HTML document, one survey per page"""
+        return self._render_template(self.bulk_template, {"pages": page_contexts}, embed_styles)
+
+    def render_pdf(self, context, target=None):
+        """Render one survey's report to PDF bytes, or into target if given"""
+        return self.write_pdf(self.render_html(context), target)
+
+    def render_bulk_pdf(self, page_contexts, target=None):
+        """
+        Lay out many surveys in a single WeasyPrint pass, so fonts and shared
+        images (logo, signature) are embedded once for the whole document.
+        """
+        return self.write_pdf(self.render_bulk_html(page_contexts), target)
+
+    def write_pdf(self, html_content, target=None):
+        # Layout and PDF writing are timed separately; asset fetches made
+        # during layout are timed by the fetcher as their own stage
+        with stage("layout"):
+            document = HTML(
+                string=html_content,
+                base_url=settings.REPORT_BASE_URL,
+                url_fetcher=local_url_fetcher,
+            ).render(
+                stylesheets=self.stylesheets,
+                font_config=self.font_config,
+                **render_options(),
+            )
+
+        with stage("write_pdf"):
+            start_offset = target.tell() if target is not None else 0
+            pdf_content = document.write_pdf(target)
+            if target is not None:
+                bytes_written = target.tell() - start_offset
+            else:
+                bytes_written = len(pdf_content)
+
+        add_output(pages=len(document.pages), bytes_written=bytes_written)
+        return pdf_content
+
+
+# One engine per thread: FontConfiguration is not safe to share across threads
+_engine_local = threading.local()
+
+
+def get_report_engine():
+    """Return this thread's warm Report115Engine, creating it on first use"""
+    engine = getattr(_engine_local, "engine", None)
+    if engine is None:
+        engine = Report115Engine()
+        _engine_local.engine = engine
+    return engine
@@ -0,0 +1,157 @@
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+from urllib.parse import unquote, urlsplit
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.utils._os import safe_join
+from weasyprint import default_url_fetcher
+from weasyprint.urls import URLFetchingError
+
+from .metrics import stage
+
+
+# ==================== ASSET CACHE ====================
+class AssetCache:
+    """
+    Thread-safe LRU cache of fetched report assets, bounded by total bytes.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        entry_size = len(entry["string"])
+        if entry_size > self.max_bytes:
+            return
+
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+            if old_entry is not None:
+                self._size -= len(old_entry["string"])
+
+            self._entries[key] = entry
+            self._size += entry_size
+
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted["string"])
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+asset_cache = AssetCache(settings.REPORT_ASSET_CACHE_MAX_BYTES)
+
+
+# ==================== PATH RESOLUTION ====================
+def _url_path_prefix(url):
+    """Path part of MEDIA_URL / STATIC_URL, which may be absolute URLs"""
+    return urlsplit(url).path
+
+
+def resolve_local_asset(url):
+    """
+    Map a MEDIA_URL / STATIC_URL asset URL to a file on local disk.
+    Returns None when the URL does not point at a local asset.
+    Raises URLFetchingError when it does but the file is missing.
+    """
+    path = unquote(urlsplit(url).path)
+
+    media_prefix = _url_path_prefix(settings.MEDIA_URL)
+    if media_prefix and path.startswith(media_prefix):
+        relative_path = path[len(media_prefix):]
+        try:
+            local_path = safe_join(settings.MEDIA_ROOT, relative_path)
+        except Exception:
+            raise URLFetchingError(f"Invalid media path: {url}")
+        if os.path.isfile(local_path):
+            return local_path
+        raise URLFetchingError(f"Media file not found: {url}")
+
+    static_prefix = _url_path_prefix(settings.STATIC_URL)
+    if static_prefix and path.startswith(static_prefix):
+        relative_path = path[len(static_prefix):]
+        if settings.STATIC_ROOT:
+            try:
+                local_path = safe_join(settings.STATIC_ROOT, relative_path)
+            except Exception:
+                raise URLFetchingError(f"Invalid static path: {url}")
+            if os.path.isfile(local_path):
+                return local_path
+
+        # Not collected yet (development) - look in STATICFILES_DIRS / app dirs
+        local_path = finders.find(relative_path)
+        if local_path:
+            return local_path
+        raise URLFetchingError(f"Static file not found: {url}")
+
+    return None
+
+
+# ==================== URL FETCHER ====================
+def local_url_fetcher(url, timeout=10, ssl_context=None):
+    """
+    WeasyPrint url_fetcher that reads MEDIA/STATIC assets straight from disk
+    and keeps the bytes in the in-process asset cache. Anything else (data:
+    URIs, external CDN links) goes to WeasyPrint's default fetcher, with
+    remote responses cached as well so they are downloaded once per process.
+    """
+    if url.startswith("data:"):
+        return default_url_fetcher(url, timeout=timeout, ssl_context=ssl_context)
+
+    with stage("asset_fetch"):
+        return _fetch_asset(url, timeout, ssl_context)
+
+
+def _fetch_asset(url, timeout, ssl_context):
+    local_path = resolve_local_asset(url)
+
+    if local_path is not None:
+        stat = os.stat(local_path)
+        cache_key = (local_path, stat.st_mtime_ns, stat.st_size)
+    else:
+        cache_key = url
+
+    entry = asset_cache.get(cache_key)
+    if entry is None:
+        if local_path is not None:
+            with open(local_path, "rb") as asset_file:
+                data = asset_file.read()
+            mime_type, encoding = mimetypes.guess_type(local_path)
+            entry = {
+                "string": data,
+                "mime_type": mime_type,
+                "encoding": encoding,
+                "redirected_url": url,
+            }
+        else:
+            result = default_url_fetcher(url, timeout=timeout, ssl_context=ssl_context)
+            if "string" in result:
+                data = result["string"]
+            else:
+                with result["file_obj"] as file_obj:
+                    data = file_obj.read()
+            entry = {
+                "string": data,
+                "mime_type": result.get("mime_type"),
+                "encoding": result.get("encoding"),
+                "redirected_url": result.get("redirected_url", url),
+            }
+        asset_cache.set(cache_key, entry)
+
+    return dict(entry)
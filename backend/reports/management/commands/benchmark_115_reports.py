@@ -0,0 +1,267 @@
+import io
+import json
+import platform
+import random
+import resource
+import sys
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from PIL import Image
+from rest_framework.test import APIRequestFactory
+
+from accounts.models import UserMaster
+from reports.metrics import report_metrics
+from reports.views_115 import BulkReport115GenerateView, SingleReport115GenerateView
+from survey.models import Survey, SurveyDeletion
+from survey.photos import build_photo_derivatives
+
+OWNER_NAMES = ["रमेश पाटील", "सुनिता जाधव", "विजय काळे", "अनिता देशमुख", "संजय शिंदे", "मीरा कुलकर्णी"]
+ROAD_NAMES = ["मुख्य रस्ता", "देहू आळंदी रस्ता", "गाथा मंदिर रस्ता", "इंद्रायणी नगर"]
+PROPERTY_TYPES = ["घरगुती", "अनिवासी", "औद्योगिक", "अपार्टमेंट", "बहुमजली इमारत"]
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size so far of this process and of its largest
+    finished child (render pool workers); ru_maxrss is KB on Linux, bytes on macOS
+    """
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / divisor, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / divisor, 1),
+    }
+
+
+def latency_summary(samples):
+    samples = sorted(samples)
+    if not samples:
+        return None
+    return {
+        "count": len(samples),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 2),
+        "p50_ms": round(samples[len(samples) // 2] * 1000, 2),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 2),
+        "max_ms": round(samples[-1] * 1000, 2),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark 115 report generation: seeds synthetic Marathi surveys with photos, "
+        "measures single-report latency, bulk ward throughput, output size and peak RSS, "
+        "and prints the results as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--surveys", type=int, default=50, help="Synthetic surveys to seed")
+        parser.add_argument(
+            "--ward", type=int, default=9000,
+            help="Ward number for the synthetic surveys; must not hold real data",
+        )
+        parser.add_argument("--single-samples", type=int, default=10, help="Surveys timed through the single view")
+        parser.add_argument("--photo-size", type=int, default=3000, help="Longest side of the seeded photos in px")
+        parser.add_argument("--seed", type=int, default=115, help="Random seed, for reproducible data")
+        parser.add_argument("--user", help="Email of the user recorded as created_by. Default: first user")
+        parser.add_argument("--output", help="Write the JSON results to this file as well as stdout")
+        parser.add_argument("--keep", action="store_true", help="Keep the seeded surveys and files afterwards")
+
+    def handle(self, *args, **options):
+        ward = options["ward"]
+        if Survey.objects.filter(ward_no=ward).exists():
+            raise CommandError(f"Ward {ward} already has surveys; pick an empty --ward for the benchmark")
+
+        user = self.get_user(options["user"])
+        rng = random.Random(options["seed"])
+        self.factory = APIRequestFactory()
+
+        results = {
+            "params": {
+                "surveys": options["surveys"],
+                "single_samples": options["single_samples"],
+                "photo_size": options["photo_size"],
+                "seed": options["seed"],
+                "render_workers": settings.REPORT_RENDER_WORKERS,
+            },
+            "environment": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "report_template_version": settings.REPORT_TEMPLATE_VERSION,
+            },
+        }
+
+        try:
+            started = time.perf_counter()
+            survey_ids = self.seed_surveys(ward, options["surveys"], options["photo_size"], user, rng)
+            results["seed_seconds"] = round(time.perf_counter() - started, 3)
+            self.stderr.write(f"Seeded {len(survey_ids)} surveys in ward {ward}")
+
+            report_metrics.drain()
+            results["single"] = self.benchmark_single(survey_ids[: options["single_samples"]])
+            results["bulk"] = {
+                "merge_cold": self.benchmark_bulk(ward, survey_ids, {"mode": "merge"}, cold=True),
+                "merge_warm": self.benchmark_bulk(ward, survey_ids, {"mode": "merge"}, cold=False),
+                "document": self.benchmark_bulk(ward, survey_ids, {"mode": "document"}, cold=False),
+                "zip_warm": self.benchmark_bulk(ward, survey_ids, {"format": "zip"}, cold=False),
+            }
+            results["stage_metrics"] = report_metrics.snapshot()
+            results["peak_rss_mb"] = peak_rss_mb()
+
+        finally:
+            if not options["keep"]:
+                self.cleanup(ward)
+
+        output = json.dumps(results, indent=2, ensure_ascii=False)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output_file:
+                output_file.write(output)
+        self.stdout.write(output)
+
+    def get_user(self, email):
+        users = UserMaster.objects.all()
+        if email:
+            users = users.filter(email=email.lower())
+        user = users.order_by("id").first()
+        if user is None:
+            raise CommandError("No user found to own the synthetic surveys; create one or pass --user")
+        return user
+
+    # ==================== SEEDING ====================
+    def make_photo(self, photo_size, rng):
+        """A noisy JPEG, about as large and incompressible as a phone photo"""
+        width, height = photo_size, photo_size * 3 // 4
+        channels = [Image.effect_noise((width, height), 40 + rng.randint(0, 20)) for _ in range(3)]
+        image = Image.merge("RGB", channels)
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=90)
+        return buffer.getvalue()
+
+    def seed_surveys(self, ward, count, photo_size, user, rng):
+        photo_bytes = self.make_photo(photo_size, rng)
+
+        surveys = []
+        for index in range(count):
+            owner = rng.choice(OWNER_NAMES)
+            pending_tax = Decimal(rng.randint(0, 5000))
+            current_tax = Decimal(rng.randint(500, 3000))
+            property_no = f"{index + 1:05d}"
+            photo_name = default_storage.save(
+                f"connection_photos/benchmark_{ward}_{property_no}.jpg", io.BytesIO(photo_bytes)
+            )
+            surveys.append(
+                Survey(
+                    ward_no=ward,
+                    property_no=property_no,
+                    old_connection_number=f"BM-{ward}-{property_no}",
+                    property_description="निवासी इमारत, दोन मजली",
+                    property_owner_name=f"Owner {index + 1}",
+                    property_owner_name_marathi=owner,
+                    property_type=rng.choice(PROPERTY_TYPES),
+                    water_connection_owner_name_marathi=owner,
+                    connection_type="अधिकृत",
+                    connection_size="15 मिमी",
+                    number_of_water_connections=rng.randint(1, 3),
+                    mobile_number=f"98{rng.randint(10000000, 99999999)}",
+                    address_marathi=f"घर क्र. {index + 1}, {rng.choice(ROAD_NAMES)}, देहू, पुणे",
+                    road_name=rng.choice(ROAD_NAMES),
+                    pincode="412109",
+                    pending_tax=pending_tax,
+                    current_tax=current_tax,
+                    total_tax=pending_tax + current_tax,
+                    remarks_marathi="नळ जोडणी तपासणी पूर्ण",
+                    connection_photo=photo_name,
+                    created_by=user,
+                )
+            )
+
+        # bulk_create sends no post_save and pre-generation is off while the
+        # derivatives are built, so nothing renders before the measurements
+        with override_settings(REPORT_PREGENERATE_ON_SAVE=False):
+            for survey in Survey.objects.bulk_create(surveys):
+                build_photo_derivatives(survey)
+
+        return list(
+            Survey.objects.filter(ward_no=ward).order_by("property_no").values_list("id", flat=True)
+        )
+
+    # ==================== MEASUREMENTS ====================
+    @staticmethod
+    def consume(response):
+        """Read a (streaming) response fully; returns its size in bytes"""
+        if response.streaming:
+            size = sum(len(chunk) for chunk in response.streaming_content)
+        else:
+            size = len(response.content)
+        response.close()
+        return size
+
+    @staticmethod
+    def mark_stale(survey_ids):
+        # Plain update: no signals, and the PDF is re-rendered on next access
+        Survey.objects.filter(id__in=survey_ids).update(pdfreport_key=None)
+
+    def benchmark_single(self, survey_ids):
+        """Latency of SingleReport115GenerateView, cold (render) and warm (cached)"""
+        view = SingleReport115GenerateView.as_view(permission_classes=[])
+        self.mark_stale(survey_ids)
+
+        cold, warm, sizes = [], [], []
+        for survey_id in survey_ids:
+            for samples in (cold, warm):
+                request = self.factory.get(f"/api/115/single/{survey_id}/")
+                started = time.perf_counter()
+                response = view(request, survey_id=survey_id)
+                size = self.consume(response)
+                samples.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    raise CommandError(f"Single report for survey {survey_id} returned {response.status_code}")
+            sizes.append(size)
+
+        return {
+            "cold": latency_summary(cold),
+            "warm": latency_summary(warm),
+            "mean_pdf_bytes": round(sum(sizes) / len(sizes)) if sizes else None,
+        }
+
+    def benchmark_bulk(self, ward, survey_ids, data, cold):
+        """Throughput of BulkReport115GenerateView for the whole synthetic ward"""
+        view = BulkReport115GenerateView.as_view(permission_classes=[])
+        if cold:
+            self.mark_stale(survey_ids)
+
+        request = self.factory.post("/api/115/bulk/", {"ward_no": ward, **data}, format="json")
+        started = time.perf_counter()
+        response = view(request)
+        size = self.consume(response)
+        elapsed = time.perf_counter() - started
+
+        if response.status_code != 200:
+            raise CommandError(f"Bulk report {data} returned {response.status_code}")
+
+        return {
+            "seconds": round(elapsed, 3),
+            "surveys_per_second": round(len(survey_ids) / elapsed, 2) if elapsed else None,
+            "output_bytes": size,
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+    def cleanup(self, ward):
+        surveys = Survey.objects.filter(ward_no=ward)
+        for survey in surveys:
+            for file_field in (
+                survey.connection_photo,
+                survey.connection_photo_report,
+                survey.connection_photo_thumbnail,
+                survey.pdfreport,
+            ):
+                if file_field:
+                    file_field.delete(save=False)
+        survey_ids = list(surveys.values_list("id", flat=True))
+        surveys.delete()
+        # Synthetic rows must not show up as deletions in delta exports
+        SurveyDeletion.objects.filter(survey_id__in=survey_ids).delete()
+        self.stderr.write(f"Removed synthetic surveys from ward {ward}")
@@ -0,0 +1,136 @@
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reports.cache import is_report_fresh
+from reports.parallel import render_reports_parallel
+from survey.models import Survey
+
+
+class Command(BaseCommand):
+    help = "(Re)generate 115 report PDFs for all surveys, selected wards/property ranges or stale ones only"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ward", type=int, action="append", dest="wards",
+            help="Ward number to regenerate (repeat for several wards). Default: all wards",
+        )
+        parser.add_argument("--property-start", help="First property number (needs --ward)")
+        parser.add_argument("--property-end", help="Last property number (needs --ward)")
+        parser.add_argument(
+            "--stale-only", action="store_true",
+            help="Only render surveys whose stored PDF is missing or out of date",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=None,
+            help="Parallel render processes. Default: REPORT_RENDER_WORKERS",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="JSON file of finished survey ids; rerun with the same file to resume",
+        )
+        parser.add_argument(
+            "--checkpoint-every", type=int, default=50,
+            help="Write the checkpoint after this many rendered surveys",
+        )
+
+    def handle(self, *args, **options):
+        wards = options["wards"]
+        property_start = options["property_start"]
+        property_end = options["property_end"]
+        checkpoint_path = options["checkpoint"]
+
+        if (property_start or property_end) and not wards:
+            raise CommandError("--property-start/--property-end need --ward")
+
+        surveys = Survey.objects.all()
+        if wards:
+            surveys = surveys.filter(ward_no__in=wards)
+        if property_start:
+            surveys = surveys.filter(property_no__gte=property_start)
+        if property_end:
+            surveys = surveys.filter(property_no__lte=property_end)
+        surveys = surveys.order_by("ward_no", "property_no")
+
+        done_ids = self.load_checkpoint(checkpoint_path)
+        if done_ids:
+            self.stdout.write(f"Resuming: {len(done_ids)} surveys already done in {checkpoint_path}")
+
+        # Work out what needs rendering
+        pending_ids = []
+        skipped_fresh = 0
+        for survey in surveys.iterator(chunk_size=500):
+            if survey.id in done_ids:
+                continue
+            if options["stale_only"] and is_report_fresh(survey):
+                skipped_fresh += 1
+                continue
+            pending_ids.append(survey.id)
+
+        if skipped_fresh:
+            self.stdout.write(f"Skipping {skipped_fresh} surveys with up-to-date PDFs")
+        if not pending_ids:
+            self.stdout.write(self.style.SUCCESS("Nothing to regenerate"))
+            return
+
+        self.stdout.write(f"Regenerating {len(pending_ids)} 115 reports...")
+
+        rendered = 0
+        failures = []
+        started = time.monotonic()
+
+        def on_result(result):
+            nonlocal rendered
+            survey_id, pdf_success, pdf_message = result
+            if pdf_success:
+                rendered += 1
+                done_ids.add(survey_id)
+            else:
+                failures.append((survey_id, pdf_message))
+                self.stderr.write(f"Survey {survey_id}: {pdf_message}")
+
+            finished = rendered + len(failures)
+            if finished % options["checkpoint_every"] == 0:
+                self.save_checkpoint(checkpoint_path, done_ids)
+                elapsed = time.monotonic() - started
+                self.stdout.write(
+                    f"  {finished}/{len(pending_ids)} done ({finished / elapsed:.1f} surveys/sec)"
+                )
+
+        try:
+            render_reports_parallel(pending_ids, workers=options["workers"], progress_callback=on_result)
+        finally:
+            self.save_checkpoint(checkpoint_path, done_ids)
+
+        # Throughput summary
+        elapsed = time.monotonic() - started
+        throughput = rendered / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rendered {rendered} PDFs in {elapsed:.1f}s ({throughput:.2f} surveys/sec), "
+                f"{len(failures)} failed, {skipped_fresh} already fresh"
+            )
+        )
+        if failures:
+            failed_ids = ", ".join(str(survey_id) for survey_id, _ in failures[:20])
+            self.stdout.write(self.style.WARNING(f"Failed survey ids: {failed_ids}"))
+
+    def load_checkpoint(self, path):
+        if not path or not os.path.exists(path):
+            return set()
+        try:
+            with open(path) as checkpoint_file:
+                return set(json.load(checkpoint_file).get("done_ids", []))
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read checkpoint {path}: {e}")
+
+    def save_checkpoint(self, path, done_ids):
+        if not path:
+            return
+        # Write then rename, so an interrupted run never leaves a torn file
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as checkpoint_file:
+            json.dump({"done_ids": sorted(done_ids)}, checkpoint_file)
+        os.replace(tmp_path, path)
@@ -0,0 +1,202 @@
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== PER-OPERATION TIMINGS ====================
+class ReportTimings:
+    """
+    Stage timings of one report operation (a single PDF, a merge, ...).
+
+    Stage times are exclusive: a stage nested in another (asset fetching
+    during layout) is subtracted from the outer one, so the stages add up
+    to the operation's total.
+    """
+
+    def __init__(self, operation, **fields):
+        self.operation = operation
+        self.fields = fields
+        self.stages = {}
+        self.pages = 0
+        self.bytes = 0
+        self.started = time.perf_counter()
+        self.total = None
+        self._open_stages = []
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        # [child time] of this stage, filled in by nested stages
+        frame = [0.0]
+        self._open_stages.append(frame)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self._open_stages.pop()
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed - frame[0]
+            if self._open_stages:
+                self._open_stages[-1][0] += elapsed
+
+    def add_output(self, pages=0, bytes_written=0):
+        self.pages += pages
+        self.bytes += bytes_written
+
+    def as_dict(self):
+        return {
+            "operation": self.operation,
+            **self.fields,
+            "stages": {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            "total": round(self.total, 6) if self.total is not None else None,
+            "pages": self.pages,
+            "bytes": self.bytes,
+        }
+
+    def finish(self, success=True):
+        self.total = time.perf_counter() - self.started
+        record = self.as_dict()
+        record["success"] = success
+
+        stage_summary = " ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in self.stages.items())
+        logger.info(
+            f"115 {self.operation} timings: total={self.total * 1000:.1f}ms {stage_summary} "
+            f"pages={self.pages} bytes={self.bytes}",
+            extra={"report_timings": record},
+        )
+        report_metrics.record(record)
+        return record
+
+
+_timings_local = threading.local()
+
+
+def current_timings():
+    """The innermost report operation being timed on this thread, if any"""
+    stack = getattr(_timings_local, "stack", None)
+    return stack[-1] if stack else None
+
+
+@contextmanager
+def report_timings(operation, **fields):
+    """Time a report operation; stage() calls on this thread are attributed to it"""
+    stack = getattr(_timings_local, "stack", None)
+    if stack is None:
+        stack = _timings_local.stack = []
+
+    timings = ReportTimings(operation, **fields)
+    stack.append(timings)
+    success = False
+    try:
+        yield timings
+        success = True
+    finally:
+        stack.pop()
+        timings.finish(success)
+
+
+@contextmanager
+def stage(name):
+    """Time a pipeline stage of the current operation; no-op outside one"""
+    timings = current_timings()
+    if timings is None:
+        yield
+        return
+    with timings.stage(name):
+        yield
+
+
+def add_output(pages=0, bytes_written=0):
+    timings = current_timings()
+    if timings is not None:
+        timings.add_output(pages, bytes_written)
+
+
+# ==================== AGGREGATED METRICS ====================
+def _percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list"""
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class ReportMetrics:
+    """
+    In-process aggregate of the last max_samples report operations:
+    per-stage p50/p95 and, per operation type, pages per second and bytes
+    written.
+    """
+
+    def __init__(self, max_samples):
+        self._records = deque(maxlen=max_samples)
+        self._lock = threading.Lock()
+
+    def record(self, record):
+        with self._lock:
+            self._records.append(record)
+
+    def merge(self, records):
+        """Add records collected in another process (render pool workers)"""
+        with self._lock:
+            self._records.extend(records)
+
+    def drain(self):
+        """Return and forget everything recorded so far"""
+        with self._lock:
+            records = list(self._records)
+            self._records.clear()
+        return records
+
+    def snapshot(self):
+        with self._lock:
+            records = list(self._records)
+
+        stage_samples = {}
+        operations = {}
+        for record in records:
+            for name, seconds in record["stages"].items():
+                stage_samples.setdefault(f"{record['operation']}.{name}", []).append(seconds)
+
+            operation = operations.setdefault(
+                record["operation"], {"samples": [], "pages": 0, "bytes": 0, "failed": 0}
+            )
+            operation["samples"].append(record["total"] or 0.0)
+            operation["pages"] += record["pages"]
+            operation["bytes"] += record["bytes"]
+            if not record.get("success", True):
+                operation["failed"] += 1
+
+        def summarize(samples):
+            samples = sorted(samples)
+            return {
+                "count": len(samples),
+                "p50_ms": round(_percentile(samples, 50) * 1000, 2),
+                "p95_ms": round(_percentile(samples, 95) * 1000, 2),
+                "total_s": round(sum(samples), 3),
+            }
+
+        operation_summaries = {}
+        for name, operation in operations.items():
+            summary = summarize(operation["samples"])
+            seconds = sum(operation["samples"])
+            summary.update({
+                "failed": operation["failed"],
+                "pages": operation["pages"],
+                "bytes_written": operation["bytes"],
+                "pages_per_second": round(operation["pages"] / seconds, 2) if seconds else None,
+            })
+            operation_summaries[name] = summary
+
+        return {
+            "samples": len(records),
+            "stages": {name: summarize(samples) for name, samples in stage_samples.items()},
+            "operations": operation_summaries,
+        }
+
+
+report_metrics = ReportMetrics(settings.REPORT_METRICS_MAX_SAMPLES)
@@ -1,3 +1,54 @@
+import uuid
 from django.db import models
+from django.utils import timezone
+from accounts.models import UserMaster
 
-# Create your models here.
+
+class BulkReportJob(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    # Request parameters
+    ward_no = models.PositiveIntegerField()
+    property_no_start = models.CharField(max_length=50, blank=True, null=True)
+    property_no_end = models.CharField(max_length=50, blank=True, null=True)
+    mode = models.CharField(max_length=20, default='merge')
+
+    # Progress
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            (STATUS_PENDING, 'Pending'),
+            (STATUS_RUNNING, 'Running'),
+            (STATUS_COMPLETED, 'Completed'),
+            (STATUS_FAILED, 'Failed'),
+        ],
+        default=STATUS_PENDING,
+    )
+    total_surveys = models.PositiveIntegerField(default=0)
+    processed_surveys = models.PositiveIntegerField(default=0)
+    failed_surveys = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    message = models.TextField(blank=True, null=True)
+
+    # Merged PDF
+    artifact = models.FileField(upload_to='bulk_reports/', blank=True, null=True)
+    expires_at = models.DateTimeField(blank=True, null=True)
+
+    created_by = models.ForeignKey(UserMaster, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def is_expired(self):
+        return self.expires_at is not None and timezone.now() >= self.expires_at
+
+    def __str__(self):
+        return f"Bulk 115 report job {self.id} - Ward {self.ward_no} ({self.status})"
@@ -0,0 +1,164 @@
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+# No model imports at module level: spawned pool children unpickle the worker
+# functions from this module before _init_render_worker has set Django up
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== POOL WORKER ====================
+def _init_render_worker():
+    """
+    Pool initializer: spawned children need their own Django setup. The
+    report engine (template, stylesheets, fonts) is loaded here as well, so
+    the first survey a worker renders does not pay for it.
+    """
+    import django
+
+    django.setup()
+
+    from .engine import get_report_engine
+
+    try:
+        get_report_engine()
+    except Exception as e:
+        # The engine is created again on first render; let that report the error
+        logger.warning(f"Could not warm the report engine in render worker: {str(e)}")
+
+
+def _render_survey(survey_id):
+    """Render and save one survey's 115 PDF; runs inside a pool process"""
+    from django.db import close_old_connections
+    from survey.models import Survey
+    from .views_115 import generate_and_save_pdf
+
+    # Pool workers outlive requests: drop connections past CONN_MAX_AGE or broken
+    close_old_connections()
+    try:
+        survey = Survey.objects.get(pk=survey_id)
+    except Survey.DoesNotExist:
+        return survey_id, False, "Survey not found"
+
+    pdf_success, pdf_message = generate_and_save_pdf(survey)
+    return survey_id, pdf_success, pdf_message
+
+
+def _render_survey_in_pool(survey_id):
+    """_render_survey plus the timing records it produced, for the parent's metrics"""
+    from .metrics import report_metrics
+
+    result = _render_survey(survey_id)
+    return result, report_metrics.drain()
+
+
+# ==================== SHARED POOL ====================
+# One pool per worker count, created on first use and kept for the life of
+# the process, so bulk requests do not start interpreters, Django and
+# WeasyPrint each time. Workers are spawned on demand, up to the count.
+_render_pools = {}
+_render_pools_lock = threading.Lock()
+
+
+def get_render_pool(workers):
+    """The process's shared render pool with this many workers"""
+    with _render_pools_lock:
+        pool = _render_pools.get(workers)
+        if pool is None:
+            # spawn: children never inherit the parent's DB connections or engines
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_render_worker,
+            )
+            _render_pools[workers] = pool
+        return pool
+
+
+def discard_render_pool(workers, pool):
+    """Drop a broken pool (a worker died) so the next call starts a new one"""
+    with _render_pools_lock:
+        if _render_pools.get(workers) is pool:
+            del _render_pools[workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ==================== PARALLEL RENDER ====================
+def render_reports_parallel(survey_ids, workers=None, progress_callback=None):
+    """
+    Render and save 115 PDFs for the given surveys across a process pool.
+
+    Returns a list of (survey_id, success, message) in property_no order.
+    A failed survey is reported in its own slot and never aborts the batch.
+    progress_callback, if given, is called with each result as it completes.
+    """
+    from survey.models import Survey
+    from .metrics import report_metrics
+
+    ordered_ids = list(
+        Survey.objects.filter(id__in=survey_ids)
+        .order_by("ward_no", "property_no")
+        .values_list("id", flat=True)
+    )
+    if not ordered_ids:
+        return []
+
+    workers = workers or settings.REPORT_RENDER_WORKERS
+
+    # Daemonic processes (Celery prefork children) cannot start a pool
+    if workers <= 1 or len(ordered_ids) <= 1 or multiprocessing.current_process().daemon:
+        serial_results = []
+        for survey_id in ordered_ids:
+            result = _render_survey(survey_id)
+            serial_results.append(result)
+            if progress_callback:
+                progress_callback(result)
+        return serial_results
+
+    results = {}
+    pool = get_render_pool(workers)
+    pool_broken = False
+    futures = {}
+    try:
+        for survey_id in ordered_ids:
+            futures[pool.submit(_render_survey_in_pool, survey_id)] = survey_id
+    except BrokenProcessPool as e:
+        pool_broken = True
+        if not futures:
+            # A worker died between calls: start over on a new pool
+            logger.warning(f"Render pool was broken, starting a new one: {str(e)}")
+            discard_render_pool(workers, pool)
+            return render_reports_parallel(ordered_ids, workers, progress_callback)
+        # Surveys not submitted are failed below
+        logger.error(f"Render pool broke while queueing: {str(e)}")
+
+    for future in as_completed(futures):
+        survey_id = futures[future]
+        try:
+            results[survey_id], timing_records = future.result()
+            report_metrics.merge(timing_records)
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                pool_broken = True
+            logger.error(f"Render worker failed for survey {survey_id}: {str(e)}")
+            results[survey_id] = (survey_id, False, str(e))
+
+        if progress_callback:
+            progress_callback(results[survey_id])
+
+    for survey_id in ordered_ids:
+        if survey_id not in results:
+            results[survey_id] = (survey_id, False, "Render pool is unavailable")
+            if progress_callback:
+                progress_callback(results[survey_id])
+
+    if pool_broken:
+        discard_render_pool(workers, pool)
+
+    logger.info(f"Rendered {len(ordered_ids)} 115 reports with {workers} workers")
+    return [results[survey_id] for survey_id in ordered_ids]
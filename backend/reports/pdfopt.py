@@ -0,0 +1,177 @@
+import hashlib
+import io
+import logging
+import tempfile
+
+from django.conf import settings
+from PyPDF2 import PdfWriter
+from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+
+# pikepdf (qpdf) is optional; without it PDFs are simply not linearized
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None
+
+logger = logging.getLogger(__name__)
+
+# Resource categories whose indirect objects are shared between documents
+SHARED_RESOURCE_TYPES = ("/Font", "/XObject", "/ExtGState", "/ColorSpace", "/Pattern", "/Shading")
+
+
+# ==================== WEASYPRINT OUTPUT OPTIONS ====================
+def render_options():
+    """
+    write_pdf options for every 115 render: images are losslessly optimized
+    and downsampled to REPORT_PDF_IMAGE_DPI; content streams stay compressed
+    (WeasyPrint's default).
+    """
+    return {
+        "optimize_images": True,
+        "dpi": settings.REPORT_PDF_IMAGE_DPI,
+        "jpeg_quality": settings.REPORT_PDF_JPEG_QUALITY,
+    }
+
+
+# ==================== RESOURCE DEDUPLICATION ====================
+def _object_digest(obj, digests, hasher):
+    """Feed a canonical form of a PDF object, references resolved, into hasher"""
+    if isinstance(obj, IndirectObject):
+        key = obj.idnum
+        if key not in digests:
+            digests[key] = None  # cycle guard
+            sub_hasher = hashlib.sha256()
+            _object_digest(obj.get_object(), digests, sub_hasher)
+            digests[key] = sub_hasher.hexdigest()
+        hasher.update(f"R{digests[key]};".encode())
+    elif isinstance(obj, StreamObject):
+        hasher.update(b"S")
+        _object_digest(DictionaryObject(obj), digests, hasher)
+        # Raw (still encoded) bytes: identical streams need not be decoded
+        data = obj._data
+        hasher.update(data if isinstance(data, bytes) else str(data).encode())
+    elif isinstance(obj, DictionaryObject):
+        hasher.update(b"<<")
+        for key in sorted(obj.keys()):
+            hasher.update(f"{key}=".encode())
+            _object_digest(obj.raw_get(key), digests, hasher)
+        hasher.update(b">>")
+    elif isinstance(obj, ArrayObject):
+        hasher.update(b"[")
+        for item in obj:
+            _object_digest(item, digests, hasher)
+        hasher.update(b"]")
+    else:
+        hasher.update(f"{type(obj).__name__}:{obj!r};".encode())
+
+
+def shared_resource_digests(reader):
+    """(idnum, digest) of every indirect font/image/... resource used by the pages"""
+    digests = {}
+    resources = {}
+    for page in reader.pages:
+        page_resources = page.get("/Resources")
+        if page_resources is None:
+            continue
+        page_resources = page_resources.get_object()
+        for resource_type in SHARED_RESOURCE_TYPES:
+            entries = page_resources.get(resource_type)
+            if entries is None:
+                continue
+            for reference in entries.get_object().values():
+                if isinstance(reference, IndirectObject) and reference.idnum not in resources:
+                    hasher = hashlib.sha256()
+                    _object_digest(reference, digests, hasher)
+                    resources[reference.idnum] = hasher.hexdigest()
+    return resources.items()
+
+
+class DedupPdfWriter(PdfWriter):
+    """
+    PdfWriter that keeps one copy of identical fonts, images and other page
+    resources across all appended documents, and compresses any content
+    stream that is not compressed yet.
+
+    PyPDF2 copies resources per source document; here resources whose
+    content matches one already written are pointed at that copy instead.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._resource_index = {}
+        self.deduplicated = 0
+
+    def append_document(self, reader):
+        """Add all pages of reader; returns the number of pages added"""
+        resources = list(shared_resource_digests(reader))
+
+        # Map the reader's duplicate resources onto the copies already written
+        translated = self._id_translated.setdefault(id(reader), {})
+        for idnum, digest in resources:
+            known_idnum = self._resource_index.get(digest)
+            if known_idnum is not None:
+                translated[idnum] = known_idnum
+                self.deduplicated += 1
+
+        for page in reader.pages:
+            added_page = self.add_page(page)
+            contents = added_page.get("/Contents")
+            if contents is not None and "/Filter" not in contents.get_object():
+                added_page.compress_content_streams()
+
+        for idnum, digest in resources:
+            if digest not in self._resource_index and idnum in translated:
+                self._resource_index[digest] = translated[idnum]
+
+        # The table is keyed by id(reader): drop it so a later reader that
+        # reuses the address cannot resolve to this document's objects
+        del self._id_translated[id(reader)]
+        return len(reader.pages)
+
+
+# ==================== LINEARIZATION ====================
+_warned_pikepdf_missing = False
+
+
+def linearize_enabled():
+    global _warned_pikepdf_missing
+    if not settings.REPORT_PDF_LINEARIZE:
+        return False
+    if pikepdf is None:
+        if not _warned_pikepdf_missing:
+            logger.warning("REPORT_PDF_LINEARIZE is on but pikepdf is not installed; PDFs are not linearized")
+            _warned_pikepdf_missing = True
+        return False
+    return True
+
+
+def linearize_pdf_bytes(pdf_content):
+    """Linearized copy of a PDF ("fast web view"), or the input unchanged"""
+    if not linearize_enabled():
+        return pdf_content
+
+    output = io.BytesIO()
+    with pikepdf.open(io.BytesIO(pdf_content)) as pdf:
+        pdf.save(output, linearize=True)
+    return output.getvalue()
+
+
+def linearize_pdf_file(pdf_file):
+    """
+    Linearize a spooled PDF temp file; returns a new temp file positioned at
+    the start (closing the input), or the input itself when disabled.
+    """
+    if not linearize_enabled():
+        return pdf_file
+
+    output_file = tempfile.TemporaryFile(suffix=".pdf")
+    try:
+        pdf_file.seek(0)
+        with pikepdf.open(pdf_file) as pdf:
+            pdf.save(output_file, linearize=True)
+    except Exception:
+        output_file.close()
+        raise
+    pdf_file.close()
+    output_file.seek(0)
+    return output_file
@@ -0,0 +1,36 @@
+# reports/signals.py
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from survey.models import Survey
+from .cache import compute_report_key
+from .tasks import pregenerate_survey_report_task
+
+# Columns written by generate_and_save_pdf itself
+REPORT_FIELDS = {"pdfreport", "pdfreport_key"}
+
+
+@receiver(post_save, sender=Survey)
+def queue_report_pregeneration(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Warm the 115 PDF in the background after a survey is created or edited"""
+    if raw or not settings.REPORT_PREGENERATE_ON_SAVE:
+        return
+
+    # Saving the rendered PDF is not an edit
+    if update_fields and set(update_fields) <= REPORT_FIELDS:
+        return
+
+    report_key = compute_report_key(instance)
+    if instance.pdfreport_key == report_key:
+        return
+
+    # Debounce: the task only renders if the survey still has this key when
+    # it runs, so a burst of edits renders once, for the last one
+    survey_id = instance.pk
+    transaction.on_commit(
+        lambda: pregenerate_survey_report_task.apply_async(
+            args=[survey_id, report_key],
+            countdown=settings.REPORT_PREGENERATE_DELAY_SECONDS,
+        )
+    )
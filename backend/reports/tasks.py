@@ -0,0 +1,121 @@
+from celery import shared_task
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+from datetime import timedelta
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True)
+def generate_bulk_report_task(self, job_id):
+    """Render/merge a ward's 115 reports and store the PDF on the job"""
+    from .models import BulkReportJob
+    from .views_115 import BulkReport115GenerateView
+
+    try:
+        job = BulkReportJob.objects.get(pk=job_id)
+    except BulkReportJob.DoesNotExist:
+        logger.error(f"Bulk report job {job_id} not found")
+        return f"Bulk report job {job_id} not found"
+
+    params = {
+        "ward_number": job.ward_no,
+        "property_no_start": job.property_no_start,
+        "property_no_end": job.property_no_end,
+        "mode": job.mode,
+    }
+
+    def report_progress(surveys_done, failures):
+        BulkReportJob.objects.filter(pk=job.pk).update(
+            processed_surveys=surveys_done,
+            failed_surveys=len(failures),
+            errors=failures[:50],
+            updated_at=timezone.now(),
+        )
+
+    try:
+        bulk_view = BulkReport115GenerateView()
+        surveys = bulk_view.get_surveys(params)
+
+        job.status = BulkReportJob.STATUS_RUNNING
+        job.total_surveys = surveys.count()
+        job.save(update_fields=["status", "total_surveys", "updated_at"])
+
+        if job.mode == "document":
+            merged_pdf = bulk_view.render_combined_document(surveys, progress_callback=report_progress)
+        else:
+            merged_pdf = bulk_view.merge_existing_pdfs(surveys, None, progress_callback=report_progress)
+
+        job.refresh_from_db()
+        with merged_pdf:
+            job.artifact.save(bulk_view.build_filename(params), File(merged_pdf), save=False)
+        job.status = BulkReportJob.STATUS_COMPLETED
+        job.message = f"{job.processed_surveys - job.failed_surveys}/{job.total_surveys} surveys included"
+        job.completed_at = timezone.now()
+        job.expires_at = job.completed_at + timedelta(hours=settings.REPORT_JOB_ARTIFACT_TTL_HOURS)
+        job.save()
+
+        logger.info(f"Bulk report job {job.id} completed: {job.message}")
+        return job.message
+
+    except Exception as exc:
+        logger.error(f"Bulk report job {job_id} failed: {str(exc)}", exc_info=True)
+        BulkReportJob.objects.filter(pk=job_id).update(
+            status=BulkReportJob.STATUS_FAILED,
+            message=str(exc),
+            completed_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        return f"Bulk report job {job_id} failed: {str(exc)}"
+
+
+@shared_task
+def cleanup_expired_bulk_reports_task():
+    """Delete merged PDFs whose download window has passed"""
+    from .models import BulkReportJob
+
+    expired_jobs = (
+        BulkReportJob.objects.filter(expires_at__lte=timezone.now())
+        .exclude(artifact__isnull=True)
+        .exclude(artifact="")
+    )
+    cleaned = 0
+    for job in expired_jobs:
+        job.artifact.delete(save=False)
+        job.artifact = None
+        job.save(update_fields=["artifact", "updated_at"])
+        cleaned += 1
+
+    if cleaned:
+        logger.info(f"Removed {cleaned} expired bulk report artifacts")
+    return cleaned
+
+
+@shared_task
+def pregenerate_survey_report_task(survey_id, report_key):
+    """
+    Render a survey's 115 PDF after it was saved. Skipped when the survey
+    changed again since (a newer task is queued for that edit) or the PDF
+    is already fresh.
+    """
+    from survey.models import Survey
+    from .cache import compute_report_key, is_report_fresh
+    from .views_115 import generate_and_save_pdf
+
+    try:
+        survey = Survey.objects.get(pk=survey_id)
+    except Survey.DoesNotExist:
+        return f"Survey {survey_id} no longer exists"
+
+    if compute_report_key(survey) != report_key:
+        return f"Survey {survey_id} changed again, skipping superseded render"
+
+    if is_report_fresh(survey):
+        return f"Survey {survey_id} PDF already up to date"
+
+    pdf_success, pdf_message = generate_and_save_pdf(survey)
+    if not pdf_success:
+        logger.error(f"Background PDF render failed for survey {survey_id}: {pdf_message}")
+    return pdf_message
@@ -1,6 +1,14 @@
 # reports/urls.py
 from django.urls import path
-from .views_115 import SingleReport115GenerateView, BulkReport115GenerateView
+from .views_115 import (
+    SingleReport115GenerateView,
+    SinglePDFDownloadView,
+    BulkReport115GenerateView,
+    BulkReport115JobCreateView,
+    BulkReport115JobStatusView,
+    BulkReport115JobDownloadView,
+    Report115MetricsView,
+)
 
 
 app_name = 'reports'
@@ -8,7 +16,12 @@ app_name = 'reports'
 urlpatterns = [
     # 115 Reports
     path('115/single/<int:survey_id>/', SingleReport115GenerateView.as_view(), name='single-report-115'),
+    path('115/download/<int:survey_id>/', SinglePDFDownloadView.as_view(), name='single-pdf-download'),
     path('115/bulk/', BulkReport115GenerateView.as_view(), name='bulk-report-115'),
+    path('115/bulk/jobs/', BulkReport115JobCreateView.as_view(), name='bulk-report-115-job-create'),
+    path('115/bulk/jobs/<uuid:job_id>/', BulkReport115JobStatusView.as_view(), name='bulk-report-115-job-status'),
+    path('115/bulk/jobs/<uuid:job_id>/download/', BulkReport115JobDownloadView.as_view(), name='bulk-report-115-job-download'),
+    path('115/metrics/', Report115MetricsView.as_view(), name='report-115-metrics'),
 
     
 ]
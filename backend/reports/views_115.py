@@ -4,24 +4,33 @@ from rest_framework import status
 from rest_framework.response import Response
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from django.http import HttpResponse, FileResponse
+from django.http import FileResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import parse_etags, quote_etag
 from rest_framework.views import APIView
-import io
+import tempfile
 from datetime import datetime
 import logging
 from rest_framework.permissions import IsAuthenticated
-from django.template.loader import render_to_string
-from weasyprint import HTML
 from django.conf import settings
 import os
 from django.core.files.base import ContentFile
 
 # PyPDF2 for merging PDFs
-from PyPDF2 import PdfWriter, PdfReader
+from PyPDF2 import PdfReader
 
 # Import from your survey app
+from django.urls import reverse
 from survey.models import Survey
+from survey.photos import derivatives_are_current
 from accounts.premissions import HasModuleAccess
+from .models import BulkReportJob
+from .tasks import generate_bulk_report_task, cleanup_expired_bulk_reports_task
+from .cache import compute_report_key, is_report_fresh
+from .engine import get_report_engine
+from .metrics import report_metrics, report_timings, stage, add_output
+from .pdfopt import DedupPdfWriter, linearize_pdf_bytes, linearize_pdf_file
+from .parallel import render_reports_parallel
+from .zipstream import stream_zip
 
 logger = logging.getLogger(__name__)
 
@@ -35,21 +44,21 @@ def generate_and_save_pdf(survey, request=None):
 
         single_report_generator = SingleReport115GenerateView()
 
-        if request is None:
-            from django.test import RequestFactory
-            request = RequestFactory().get("/")
-            # request.build_absolute_uri = lambda uri="": f"http://localhost/{uri}"
-            request.build_absolute_uri = lambda uri="": f"https://dehu.lohamuncipal.in/{uri}"
-
-        pdf_content = single_report_generator.generate_single_report(
-            survey, "pdf", request
-        )
+        with report_timings("single", survey_id=survey.id):
+            report_key = compute_report_key(survey)
+            pdf_content = single_report_generator.generate_single_report(
+                survey, "pdf", request
+            )
+            with stage("postprocess"):
+                pdf_content = linearize_pdf_bytes(pdf_content)
 
-        pdf_filename = f"Survey_Report_Ward_{survey.ward_no}_Property_{survey.property_no}_{survey.id}.pdf"
+            pdf_filename = f"Survey_Report_Ward_{survey.ward_no}_Property_{survey.property_no}_{survey.id}.pdf"
 
-        # REMOVE save=False
-        survey.pdfreport.save(pdf_filename, ContentFile(pdf_content))
-        survey.save()  # <<< REQUIRED
+            # Only the report columns are written, so updated_at is left alone
+            with stage("save"):
+                survey.pdfreport.save(pdf_filename, ContentFile(pdf_content), save=False)
+                survey.pdfreport_key = report_key
+                survey.save(update_fields=["pdfreport", "pdfreport_key"])
 
         return True, "PDF generated successfully"
 
@@ -57,6 +66,35 @@ def generate_and_save_pdf(survey, request=None):
         return False, str(e)
 
 
+def ensure_fresh_pdf(survey, request=None):
+    """Serve-from-cache helper: regenerate pdfreport only if missing or stale"""
+    if is_report_fresh(survey):
+        return True, "PDF is up to date"
+    return generate_and_save_pdf(survey, request)
+
+
+def pdf_file_response(request, file_path, filename, etag_value):
+    """
+    Stream a stored PDF with an ETag; answers 304 Not Modified when the
+    client's If-None-Match already has this version
+    """
+    etag = quote_etag(etag_value)
+
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        client_etags = parse_etags(if_none_match)
+        if "*" in client_etags or etag in client_etags:
+            response = HttpResponseNotModified()
+            response["ETag"] = etag
+            return response
+
+    response = FileResponse(open(file_path, "rb"), content_type="application/pdf")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    return response
+
+
 
 # ==================== SINGLE REPORT 115 VIEW ====================
 @method_decorator(csrf_exempt, name="dispatch")
@@ -70,11 +108,16 @@ class SingleReport115GenerateView(APIView):
         try:
             survey = Survey.objects.get(pk=survey_id)
 
-            report_content = self.generate_single_report(survey, "pdf", request)
-            response = HttpResponse(report_content, content_type="application/pdf")
+            # Serve the stored PDF while it is fresh, re-render only when stale
+            pdf_success, pdf_message = ensure_fresh_pdf(survey, request)
+            if not pdf_success:
+                return Response(
+                    {"success": False, "message": f"PDF generation failed: {pdf_message}"},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
+
             filename = f"Report_115_Single_Ward_{survey.ward_no}_Property_{survey.property_no}.pdf"
-            response["Content-Disposition"] = f'attachment; filename="{filename}"'
-            return response
+            return pdf_file_response(request, survey.pdfreport.path, filename, survey.pdfreport_key)
             
         except Survey.DoesNotExist:
             return Response(
@@ -88,22 +131,21 @@ class SingleReport115GenerateView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-    def generate_single_report(self, survey, format_type, request):
+    def generate_single_report(self, survey, format_type, request=None):
         """Generate single report - PDF or HTML"""
-        context = self.prepare_report_context(survey, request)
-        html_content = render_to_string("report_115_template.html", context)
+        with stage("db"):
+            context = self.prepare_report_context(survey, request)
+
+        # Warm engine: template, stylesheets and fonts are loaded once per
+        # process; assets are read from disk by the local URL fetcher
+        engine = get_report_engine()
 
         if format_type == "pdf":
-            pdf_buffer = io.BytesIO()
-            HTML(
-                string=html_content, base_url=request.build_absolute_uri("/")
-            ).write_pdf(pdf_buffer)
-            pdf_buffer.seek(0)
-            return pdf_buffer.getvalue()
+            return engine.render_pdf(context)
         else:
-            return html_content.encode("utf-8")
+            return engine.render_html(context, embed_styles=True).encode("utf-8")
 
-    def prepare_report_context(self, survey, request):
+    def prepare_report_context(self, survey, request=None):
         """Prepare context data for report"""
         floors = []
 
@@ -115,16 +157,20 @@ class SingleReport115GenerateView(APIView):
         except Exception as e:
             logger.error(f"Error preparing floor data for survey {survey.id}: {e}", exc_info=True)
 
-        # Property image
+        # Property image (relative URL, resolved from MEDIA_ROOT by the fetcher).
+        # Prefer the resized report copy when it was built from the current
+        # photo; otherwise the original (not built yet, replaced or failed)
         property_image_url = None
-        if hasattr(survey, "connection_photo") and survey.connection_photo:
+        if derivatives_are_current(survey):
+            property_photo = survey.connection_photo_report or survey.connection_photo
+        else:
+            property_photo = survey.connection_photo
+        if property_photo:
             try:
-                if hasattr(survey.connection_photo, "url"):
-                    property_image_url = request.build_absolute_uri(survey.connection_photo.url)
+                if hasattr(property_photo, "url"):
+                    property_image_url = property_photo.url
                 else:
-                    property_image_url = request.build_absolute_uri(
-                        settings.MEDIA_URL + str(survey.connection_photo)
-                    )
+                    property_image_url = settings.MEDIA_URL + str(property_photo)
             except Exception as e:
                 logger.warning(f"Error building property image URL: {e}")
 
@@ -134,10 +180,8 @@ class SingleReport115GenerateView(APIView):
             "ulb": {"system_name": "देहू नगरपरिषद"},
             "notice_date": datetime.now().strftime("%d/%m/%Y"),
             "current_date": datetime.now().strftime("%d/%m/%Y"),
-            "logo_url": request.build_absolute_uri(settings.MEDIA_URL + "images/dehulogo.png"),
-            "signature_url": request.build_absolute_uri(settings.MEDIA_URL + "images/signature.png"),
-            "regular_font_url": request.build_absolute_uri(settings.STATIC_URL + "fonts/NotoSansDevanagari-Regular.ttf"),
-            "bold_font_url": request.build_absolute_uri(settings.STATIC_URL + "fonts/NotoSansDevanagari-Bold.ttf"),
+            "logo_url": settings.MEDIA_URL + "images/dehulogo.png",
+            "signature_url": settings.MEDIA_URL + "images/signature.png",
             "property_image_url": property_image_url,
             "has_floors": len(floors) > 0,
         }
@@ -148,6 +192,10 @@ class SingleReport115GenerateView(APIView):
 class BulkReport115GenerateView(APIView):
     """
     Merge all reports into single PDF and download
+
+    mode = "merge" (default): merge the saved per-survey PDFs
+    mode = "document": render all surveys as one document in a single pass
+    format = "zip": stream the saved per-survey PDFs as a ZIP bundle instead
     """
     
     permission_classes = [IsAuthenticated, HasModuleAccess]
@@ -155,58 +203,29 @@ class BulkReport115GenerateView(APIView):
 
     def post(self, request):
         try:
-            ward_no = request.data.get("ward_no")
-            property_no_start = request.data.get("property_no_start")
-            property_no_end = request.data.get("property_no_end")
+            params, error_response = self.parse_bulk_request(request)
+            if error_response:
+                return error_response
 
-            # Validation
-            if not ward_no:
-                return Response(
-                    {"success": False, "message": "Ward number आवश्यक आहे"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-            try:
-                ward_number = int(ward_no)
-            except (ValueError, TypeError):
-                return Response(
-                    {"success": False, "message": "कृपया योग्य ward number टाका"},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
-
-            # Query building
-            surveys_query = Survey.objects.filter(ward_no=ward_number)
-
-            # Property range optional
-            if property_no_start and property_no_end:
-                surveys_query = surveys_query.filter(
-                    property_no__gte=property_no_start,
-                    property_no__lte=property_no_end,
-                )
-
-            surveys = surveys_query.order_by("property_no")
+            surveys = self.get_surveys(params)
 
             if not surveys.exists():
-                if property_no_start and property_no_end:
-                    message = f"Ward {ward_number}, Property {property_no_start}-{property_no_end} data उपलब्ध नाही"
-                else:
-                    message = f"Ward {ward_number} साठी data उपलब्ध नाही"
-                return Response(
-                    {"success": False, "message": message},
-                    status=status.HTTP_404_NOT_FOUND,
-                )
+                return self.no_data_response(params)
 
-            # Generate/ensure PDFs exist and merge them
-            merged_pdf = self.merge_existing_pdfs(surveys, request)
+            if params["format"] == "zip":
+                return self.zip_bundle_response(surveys, params)
 
-            # Create filename
-            if property_no_start and property_no_end:
-                filename = f"Survey_Reports_Ward_{ward_number}_Property_{property_no_start}_to_{property_no_end}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+            if params["mode"] == "document":
+                # Single WeasyPrint pass over all surveys
+                merged_pdf = self.render_combined_document(surveys)
             else:
-                filename = f"Survey_Reports_Ward_{ward_number}_All_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+                # Generate/ensure PDFs exist and merge them
+                merged_pdf = self.merge_existing_pdfs(surveys, request)
 
-            # Return merged PDF
-            response = HttpResponse(merged_pdf, content_type="application/pdf")
+            # Stream the spooled PDF; FileResponse sets Content-Length from
+            # the file size and closes (deletes) the temp file when done
+            filename = self.build_filename(params)
+            response = FileResponse(merged_pdf, content_type="application/pdf")
             response["Content-Disposition"] = f'attachment; filename="{filename}"'
             return response
 
@@ -217,63 +236,252 @@ class BulkReport115GenerateView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-    def merge_existing_pdfs(self, surveys, request):
+    def parse_bulk_request(self, request):
+        """Validate request data, returns (params, error_response)"""
+        ward_no = request.data.get("ward_no")
+        property_no_start = request.data.get("property_no_start")
+        property_no_end = request.data.get("property_no_end")
+        render_mode = request.data.get("mode") or "merge"
+        # "format" in the POST body; DRF reserves the ?format= query param
+        output_format = request.data.get("format") or "pdf"
+
+        # Validation
+        if not ward_no:
+            return None, Response(
+                {"success": False, "message": "Ward number आवश्यक आहे"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if render_mode not in ("merge", "document"):
+            return None, Response(
+                {"success": False, "message": "mode must be 'merge' or 'document'"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if output_format not in ("pdf", "zip"):
+            return None, Response(
+                {"success": False, "message": "format must be 'pdf' or 'zip'"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            ward_number = int(ward_no)
+        except (ValueError, TypeError):
+            return None, Response(
+                {"success": False, "message": "कृपया योग्य ward number टाका"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        params = {
+            "ward_number": ward_number,
+            "property_no_start": property_no_start,
+            "property_no_end": property_no_end,
+            "mode": render_mode,
+            "format": output_format,
+        }
+        return params, None
+
+    @staticmethod
+    def get_surveys(params):
+        """Surveys for the ward and optional property range, in property_no order"""
+        surveys_query = Survey.objects.select_related("created_by").filter(ward_no=params["ward_number"])
+
+        # Property range optional
+        if params["property_no_start"] and params["property_no_end"]:
+            surveys_query = surveys_query.filter(
+                property_no__gte=params["property_no_start"],
+                property_no__lte=params["property_no_end"],
+            )
+
+        return surveys_query.order_by("property_no")
+
+    @staticmethod
+    def no_data_response(params):
+        ward_number = params["ward_number"]
+        if params["property_no_start"] and params["property_no_end"]:
+            message = f"Ward {ward_number}, Property {params['property_no_start']}-{params['property_no_end']} data उपलब्ध नाही"
+        else:
+            message = f"Ward {ward_number} साठी data उपलब्ध नाही"
+        return Response(
+            {"success": False, "message": message},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+
+    @staticmethod
+    def build_filename(params):
+        ward_number = params["ward_number"]
+        extension = params.get("format") or "pdf"
+        if params["property_no_start"] and params["property_no_end"]:
+            return f"Survey_Reports_Ward_{ward_number}_Property_{params['property_no_start']}_to_{params['property_no_end']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+        return f"Survey_Reports_Ward_{ward_number}_All_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+
+    def zip_bundle_response(self, surveys, params):
+        """
+        Stream the saved per-survey PDFs as a ZIP bundle. Entries are stored,
+        not recompressed, and the PDFs are never parsed, so the download runs
+        at close to disk read speed.
+        """
+        # Generate missing or stale PDFs first; the archive is streamed after
+        surveys, failed_ids, failures = self.ensure_survey_pdfs(surveys)
+        if failures:
+            logger.warning(f"Skipping {len(failures)} surveys in ZIP bundle: {failures[:5]}")
+
+        entries = [
+            (survey.pdfreport.path, f"Ward_{survey.ward_no}_Property_{survey.property_no}_{survey.id}.pdf")
+            for survey in surveys
+            if survey.id not in failed_ids
+        ]
+        if not entries:
+            return Response(
+                {"success": False, "message": "PDF generation failed", "errors": failures[:10]},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        filename = self.build_filename(params)
+        response = StreamingHttpResponse(stream_zip(entries), content_type="application/zip")
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    def render_combined_document(self, surveys, progress_callback=None):
         """
-        Merge existing single PDFs into one combined PDF using PyPDF2
+        Render all surveys as one HTML document with page breaks and lay it
+        out in a single WeasyPrint pass, so fonts, logo and signature are
+        embedded once instead of once per property.
+        Returns the PDF spooled to a temporary file, positioned at the start.
         """
-        try:
-            pdf_writer = PdfWriter()
-            missing_pdfs = []
-            generated_pdfs = []
+        single_report_generator = SingleReport115GenerateView()
+
+        with report_timings("document"):
+            with stage("db"):
+                page_contexts = [
+                    single_report_generator.prepare_report_context(survey) for survey in surveys
+                ]
+
+            output_file = tempfile.TemporaryFile(suffix=".pdf")
+            try:
+                get_report_engine().render_bulk_pdf(page_contexts, target=output_file)
+                with stage("postprocess"):
+                    output_file = linearize_pdf_file(output_file)
+            except Exception:
+                output_file.close()
+                raise
+        output_file.seek(0)
+        logger.info(f"Rendered {len(page_contexts)} surveys as a single 115 document")
+
+        if progress_callback:
+            progress_callback(len(page_contexts), [])
+        return output_file
+
+    def ensure_survey_pdfs(self, surveys, progress_callback=None):
+        """
+        Make sure every survey has a fresh saved PDF, rendering missing or
+        stale ones across the render process pool.
+        Returns (surveys, failed_ids, failures) with pdfreport refreshed.
+        progress_callback, if given, is called with (surveys_done, failures)
+        as PDFs become ready.
+        """
+        surveys = list(surveys)
+        failures = []
+        generated_pdfs = []
+        failed_ids = set()
+
+        missing_ids = [survey.id for survey in surveys if not is_report_fresh(survey)]
+        surveys_done = len(surveys) - len(missing_ids)
+        if progress_callback:
+            progress_callback(surveys_done, failures)
+
+        def on_render_result(result):
+            nonlocal surveys_done
+            survey_id, pdf_success, pdf_message = result
+            if pdf_success:
+                generated_pdfs.append(survey_id)
+                logger.info(f"Generated missing PDF for survey {survey_id}")
+            else:
+                failed_ids.add(survey_id)
+                failures.append(f"Survey {survey_id}: {pdf_message}")
+                logger.error(f"Failed to generate PDF for survey {survey_id}: {pdf_message}")
+
+            surveys_done += 1
+            if progress_callback:
+                progress_callback(surveys_done, failures)
+
+        if missing_ids:
+            render_reports_parallel(missing_ids, progress_callback=on_render_result)
+            refreshed = Survey.objects.in_bulk(missing_ids)
 
             for survey in surveys:
-                try:
-                    # Check if PDF exists and is valid
-                    if not survey.pdfreport or not os.path.isfile(survey.pdfreport.path):
-                        # Generate PDF if not exists
-                        pdf_success, pdf_message = generate_and_save_pdf(survey, request)
-                        if pdf_success:
-                            survey.save()
-                            generated_pdfs.append(survey.id)
-                            logger.info(f"Generated missing PDF for survey {survey.id}")
-                        else:
-                            missing_pdfs.append(f"Survey {survey.id}: {pdf_message}")
-                            logger.error(f"Failed to generate PDF for survey {survey.id}: {pdf_message}")
+                if survey.id in refreshed:
+                    survey.pdfreport = refreshed[survey.id].pdfreport
+
+        if generated_pdfs:
+            logger.info(f"Generated {len(generated_pdfs)} missing PDFs: {generated_pdfs}")
+
+        return surveys, failed_ids, failures
+
+    def merge_existing_pdfs(self, surveys, request, progress_callback=None):
+        """
+        Merge existing single PDFs into one combined PDF using PyPDF2.
+        progress_callback, if given, is called with (surveys_done, failures)
+        as PDFs become ready.
+        Returns the merged PDF spooled to a temporary file, positioned at the
+        start, so it is never held in memory as one bytes object.
+        """
+        try:
+            with report_timings("merge"):
+                # Identical fonts/images across the per-survey PDFs are written once
+                pdf_writer = DedupPdfWriter()
+
+                # Generate missing or stale PDFs across the render process pool
+                with stage("render_missing"):
+                    surveys, failed_ids, missing_pdfs = self.ensure_survey_pdfs(surveys, progress_callback)
+
+                with stage("merge_read"):
+                    for survey in surveys:
+                        if survey.id in failed_ids:
                             continue
 
-                    # Merge existing PDF
-                    with open(survey.pdfreport.path, "rb") as pdf_file:
-                        pdf_reader = PdfReader(pdf_file, strict=False)
-                        for page in pdf_reader.pages:
-                            pdf_writer.add_page(page)
-
-                        
-                        logger.info(f"Added {len(pdf_reader.pages)} pages from survey {survey.id}")
-
-                except Exception as e:
-                    logger.error(f"Error processing PDF for survey {survey.id}: {str(e)}")
-                    missing_pdfs.append(f"Survey {survey.id}: Processing error - {str(e)}")
-
-            # Write merged PDF to buffer
-            output_buffer = io.BytesIO()
-            pdf_writer.write(output_buffer)
-            pdf_writer.close()
-            output_buffer.seek(0)
-            merged_content = output_buffer.getvalue()
-            output_buffer.close()
-
-            # Log summary
-            total_surveys = surveys.count()
-            successful_merges = total_surveys - len(missing_pdfs)
-            logger.info(f"PDF merge completed: {successful_merges}/{total_surveys} PDFs merged successfully")
-            
-            if generated_pdfs:
-                logger.info(f"Generated {len(generated_pdfs)} missing PDFs: {generated_pdfs}")
+                        try:
+                            # Merge existing PDF
+                            with open(survey.pdfreport.path, "rb") as pdf_file:
+                                pdf_reader = PdfReader(pdf_file, strict=False)
+                                pages_added = pdf_writer.append_document(pdf_reader)
+
+                                logger.info(f"Added {pages_added} pages from survey {survey.id}")
+
+                        except Exception as e:
+                            logger.error(f"Error processing PDF for survey {survey.id}: {str(e)}")
+                            missing_pdfs.append(f"Survey {survey.id}: Processing error - {str(e)}")
+
+                if progress_callback:
+                    progress_callback(len(surveys) - len(failed_ids), missing_pdfs)
+
+                # Write merged PDF to a temp file on disk
+                output_file = tempfile.TemporaryFile(suffix=".pdf")
+                try:
+                    with stage("merge_write"):
+                        pdf_writer.write(output_file)
+                    with stage("postprocess"):
+                        output_file = linearize_pdf_file(output_file)
+                    output_file.seek(0, os.SEEK_END)
+                    add_output(pages=len(pdf_writer.pages), bytes_written=output_file.tell())
+                except Exception:
+                    output_file.close()
+                    raise
+                finally:
+                    pdf_writer.close()
+                output_file.seek(0)
+                if pdf_writer.deduplicated:
+                    logger.info(f"Merged PDF shares {pdf_writer.deduplicated} duplicate fonts/images")
+
+                # Log summary
+                total_surveys = len(surveys)
+                successful_merges = total_surveys - len(missing_pdfs)
+                logger.info(f"PDF merge completed: {successful_merges}/{total_surveys} PDFs merged successfully")
             
-            if missing_pdfs:
-                logger.warning(f"Failed to process {len(missing_pdfs)} PDFs: {missing_pdfs[:5]}")
+                if missing_pdfs:
+                    logger.warning(f"Failed to process {len(missing_pdfs)} PDFs: {missing_pdfs[:5]}")
 
-            return merged_content
+                return output_file
 
         except ImportError:
             logger.error("PyPDF2 not installed. Install with: pip install PyPDF2")
@@ -295,24 +503,17 @@ class SinglePDFDownloadView(APIView):
         try:
             survey = Survey.objects.get(id=survey_id)
 
-            # Generate PDF if not exists
-            if not survey.pdfreport or not os.path.isfile(survey.pdfreport.path):
-                pdf_success, pdf_message = generate_and_save_pdf(survey, request)
-                if not pdf_success:
-                    return Response(
-                        {"success": False, "message": f"PDF generation failed: {pdf_message}"},
-                        status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    )
-                survey.save()
+            # Generate PDF if missing or stale
+            pdf_success, pdf_message = ensure_fresh_pdf(survey, request)
+            if not pdf_success:
+                return Response(
+                    {"success": False, "message": f"PDF generation failed: {pdf_message}"},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
 
             # Download PDF
-            response = FileResponse(
-                open(survey.pdfreport.path, "rb"), content_type="application/pdf"
-            )
             filename = f"Survey_Ward_{survey.ward_no}_Property_{survey.property_no}.pdf"
-            response["Content-Disposition"] = f'attachment; filename="{filename}"'
-
-            return response
+            return pdf_file_response(request, survey.pdfreport.path, filename, survey.pdfreport_key)
 
         except Survey.DoesNotExist:
             return Response(
@@ -324,4 +525,159 @@ class SinglePDFDownloadView(APIView):
             return Response(
                 {"success": False, "message": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
\ No newline at end of file
+            )
+
+# ==================== BACKGROUND BULK REPORT JOBS ====================
+@method_decorator(csrf_exempt, name="dispatch")
+class BulkReport115JobCreateView(BulkReport115GenerateView):
+    """
+    Queue a bulk 115 report as a background job and return its id immediately.
+    Accepts the same parameters as BulkReport115GenerateView.
+    """
+
+    def post(self, request):
+        try:
+            params, error_response = self.parse_bulk_request(request)
+            if error_response:
+                return error_response
+
+            # ZIP bundles stream straight from the saved PDFs, no job needed
+            if params["format"] != "pdf":
+                return Response(
+                    {"success": False, "message": "Background jobs produce PDF only; use format=zip on the bulk endpoint"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            surveys = self.get_surveys(params)
+            if not surveys.exists():
+                return self.no_data_response(params)
+
+            # Drop artifacts whose download window has passed
+            cleanup_expired_bulk_reports_task.delay()
+
+            job = BulkReportJob.objects.create(
+                ward_no=params["ward_number"],
+                property_no_start=params["property_no_start"],
+                property_no_end=params["property_no_end"],
+                mode=params["mode"],
+                total_surveys=surveys.count(),
+                created_by=request.user,
+            )
+
+            # Runs inline when CELERY_TASK_ALWAYS_EAGER is on
+            generate_bulk_report_task.delay(str(job.id))
+            logger.info(f"Bulk report job {job.id} queued for Ward {job.ward_no}")
+
+            return Response(
+                {
+                    "success": True,
+                    "message": "Bulk report job queued",
+                    "job_id": str(job.id),
+                    "status_url": reverse("reports:bulk-report-115-job-status", args=[job.id]),
+                },
+                status=status.HTTP_202_ACCEPTED,
+            )
+
+        except Exception as e:
+            logger.error(f"Bulk report job error: {str(e)}", exc_info=True)
+            return Response(
+                {"success": False, "message": f"Bulk report job error: {str(e)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class BulkReport115JobStatusView(APIView):
+    """Progress of a background bulk 115 report job"""
+
+    permission_classes = [IsAuthenticated, HasModuleAccess]
+    required_permission = "generate-report-115"
+
+    def get(self, request, job_id):
+        try:
+            job = BulkReportJob.objects.get(pk=job_id)
+        except BulkReportJob.DoesNotExist:
+            return Response(
+                {"success": False, "message": "Job not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        download_url = None
+        if job.status == BulkReportJob.STATUS_COMPLETED and job.artifact and not job.is_expired():
+            download_url = reverse("reports:bulk-report-115-job-download", args=[job.id])
+
+        return Response(
+            {
+                "success": True,
+                "data": {
+                    "job_id": str(job.id),
+                    "status": job.status,
+                    "ward_no": job.ward_no,
+                    "property_no_start": job.property_no_start,
+                    "property_no_end": job.property_no_end,
+                    "mode": job.mode,
+                    "total_surveys": job.total_surveys,
+                    "processed_surveys": job.processed_surveys,
+                    "failed_surveys": job.failed_surveys,
+                    "errors": job.errors[:10],
+                    "message": job.message,
+                    "download_url": download_url,
+                    "expires_at": job.expires_at,
+                    "created_at": job.created_at,
+                    "completed_at": job.completed_at,
+                },
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class BulkReport115JobDownloadView(APIView):
+    """Download the merged PDF of a completed bulk 115 report job"""
+
+    permission_classes = [IsAuthenticated, HasModuleAccess]
+    required_permission = "generate-report-115"
+
+    def get(self, request, job_id):
+        try:
+            job = BulkReportJob.objects.get(pk=job_id)
+        except BulkReportJob.DoesNotExist:
+            return Response(
+                {"success": False, "message": "Job not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        if job.status != BulkReportJob.STATUS_COMPLETED:
+            return Response(
+                {"success": False, "message": f"Job is {job.status}"},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        if job.is_expired() or not job.artifact or not os.path.isfile(job.artifact.path):
+            return Response(
+                {"success": False, "message": "Report has expired, please generate it again"},
+                status=status.HTTP_410_GONE,
+            )
+
+        # Artifacts never change once written, so the job id is a stable ETag
+        return pdf_file_response(
+            request, job.artifact.path, os.path.basename(job.artifact.name), str(job.id)
+        )
+
+
+# ==================== REPORT TIMING METRICS ====================
+@method_decorator(csrf_exempt, name="dispatch")
+class Report115MetricsView(APIView):
+    """
+    Per-stage p50/p95, pages per second and bytes written for the recent 115
+    report operations of this server process (Celery workers keep their own)
+    """
+
+    permission_classes = [IsAuthenticated, HasModuleAccess]
+    required_permission = "generate-report-115"
+
+    def get(self, request):
+        return Response(
+            {"success": True, "data": report_metrics.snapshot()},
+            status=status.HTTP_200_OK,
+        )
@@ -0,0 +1,64 @@
+import zipfile
+
+ZIP_CHUNK_SIZE = 64 * 1024
+
+
+# ==================== STREAMING ZIP ====================
+class _ZipStreamSink:
+    """
+    Write-only file object for zipfile. It has tell() but no seek(), so
+    zipfile writes local headers up front and sizes/CRC in data descriptors,
+    and the archive can be sent while it is being built.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._offset = 0
+
+    def write(self, data):
+        self._buffer += data
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        """Return and clear the bytes written since the last pop"""
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def stream_zip(entries):
+    """
+    Yield a ZIP archive chunk by chunk from (file_path, arcname) pairs.
+
+    Files are added with ZIP_STORED: no recompression and no parsing, just a
+    CRC over the bytes as they are read from disk, so memory use stays at one
+    chunk however large the archive gets.
+    """
+    sink = _ZipStreamSink()
+    with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED, allowZip64=True) as zip_file:
+        for file_path, arcname in entries:
+            zip_info = zipfile.ZipInfo.from_file(file_path, arcname)
+            zip_info.compress_type = zipfile.ZIP_STORED
+
+            with open(file_path, "rb") as source, zip_file.open(zip_info, mode="w") as target:
+                while True:
+                    chunk = source.read(ZIP_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    target.write(chunk)
+                    data = sink.pop()
+                    if data:
+                        yield data
+
+            # Data descriptor for the entry just closed
+            yield sink.pop()
+
+    # Central directory
+    yield sink.pop()
@@ -0,0 +1,468 @@
+import csv
+import hashlib
+import json
+import logging
+import pickle
+import tempfile
+from datetime import date, datetime, timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import get_column_letter
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import Survey
+
+logger = logging.getLogger(__name__)
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# format -> content type; xlsx is the default
+EXPORT_FORMATS = {
+    "xlsx": XLSX_CONTENT_TYPE,
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson; charset=utf-8",
+}
+
+# Bytes gathered before a streamed chunk is sent
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Columns of every survey export, in order
+EXPORT_FIELDS = [
+    "id",
+    "ward_no",
+    "property_no",
+    "old_connection_number",
+    "property_description",
+    "property_owner_name",
+    "property_owner_name_marathi",
+    "property_type",
+    "number_of_building",
+    "water_connection_owner_name",
+    "water_connection_owner_name_marathi",
+    "connection_type",
+    "connection_size",
+    "number_of_water_connections",
+    "mobile_number",
+    "pincode",
+    "address",
+    "address_marathi",
+    "pending_tax",
+    "current_tax",
+    "total_tax",
+    "remarks",
+    "remarks_marathi",
+    "created_by",
+    "created_at",
+    "updated_at",
+]
+
+MAX_COLUMN_WIDTH = 50
+
+
+def make_naive(dt):
+    # Excel cells cannot hold timezone-aware datetimes
+    if isinstance(dt, datetime):
+        return dt.replace(tzinfo=None)
+    return dt
+
+
+def value_fields(fields=EXPORT_FIELDS):
+    """values_list() lookups for export fields; the creator is exported by email"""
+    return ["created_by__email" if fld == "created_by" else fld for fld in fields]
+
+
+def iter_survey_values(surveys, fields=EXPORT_FIELDS):
+    """
+    Plain value tuples straight from the database cursor, in chunks: only
+    the requested columns are read
+    """
+    return surveys.values_list(*value_fields(fields)).iterator(
+        chunk_size=settings.SURVEY_EXPORT_CHUNK_SIZE
+    )
+
+
+def iter_survey_rows(surveys, fields=EXPORT_FIELDS):
+    """Spreadsheet rows of a survey queryset, in fields order"""
+    for row in iter_survey_values(surveys, fields):
+        yield [make_naive(value) for value in row]
+
+
+# ==============================
+# FIELD PROJECTION
+# ==============================
+# Every concrete Survey field may be requested; created_by is the creator's email
+SURVEY_FIELDS = [field.name for field in Survey._meta.concrete_fields]
+
+
+def get_requested_fields(request, allowed_fields=SURVEY_FIELDS, default_fields=EXPORT_FIELDS):
+    """
+    fields= from the request body (list or comma-separated) or query string.
+    Returns (fields, error_response); default_fields when not given.
+    """
+    value = request.data.get("fields") or request.query_params.get("fields")
+    if not value:
+        return list(default_fields), None
+
+    if isinstance(value, str):
+        value = value.split(",")
+    fields = []
+    for name in value:
+        name = str(name).strip()
+        if name and name not in fields:
+            fields.append(name)
+
+    unknown = [name for name in fields if name not in allowed_fields]
+    if unknown or not fields:
+        return None, Response(
+            {
+                "success": False,
+                "message": f"Unknown fields: {', '.join(unknown)}. Allowed fields: {', '.join(allowed_fields)}",
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    return fields, None
+
+
+def select_survey_fields(surveys, fields):
+    """Load only these columns; the creator (its email) is joined only when asked for"""
+    model_fields = [name for name in fields if name != "created_by"]
+    if "created_by" in fields:
+        return surveys.select_related("created_by").only(*model_fields, "created_by__email")
+    return surveys.select_related(None).only(*model_fields)
+
+
+# ==============================
+# XLSX WRITER
+# ==============================
+class SurveyExcelWriter:
+    """
+    Write survey rows to an .xlsx file with openpyxl write-only mode.
+
+    Write-only sheets need column widths before the first row, so rows are
+    first spooled to a temp file while a running per-column maximum is
+    kept, then replayed into the sheet. Neither pass holds the dataset in
+    memory.
+    """
+
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+
+    def __init__(self, sheet_title, headers=EXPORT_FIELDS):
+        self.sheet_title = sheet_title
+        self.headers = list(headers)
+        self.row_count = 0
+
+    def write(self, rows):
+        """Write header + rows; returns the .xlsx as a temp file at position 0"""
+        column_widths = [len(str(header)) for header in self.headers]
+
+        with tempfile.TemporaryFile() as spool:
+            for row in rows:
+                for index, value in enumerate(row):
+                    width = len(str(value))
+                    if width > column_widths[index]:
+                        column_widths[index] = width
+                pickle.dump(row, spool, protocol=pickle.HIGHEST_PROTOCOL)
+                self.row_count += 1
+
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet(self.sheet_title)
+            for index, width in enumerate(column_widths, start=1):
+                ws.column_dimensions[get_column_letter(index)].width = min(width + 2, MAX_COLUMN_WIDTH)
+
+            ws.append([self.header_cell(ws, header) for header in self.headers])
+
+            spool.seek(0)
+            while True:
+                try:
+                    ws.append(pickle.load(spool))
+                except EOFError:
+                    break
+
+            excel_file = tempfile.TemporaryFile(suffix=".xlsx")
+            try:
+                wb.save(excel_file)
+            except Exception:
+                excel_file.close()
+                raise
+
+        excel_file.seek(0)
+        return excel_file
+
+    def header_cell(self, ws, header):
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = self.header_font
+        cell.fill = self.header_fill
+        cell.alignment = self.header_alignment
+        return cell
+
+
+def excel_export_response(surveys, sheet_title, filename, fields=EXPORT_FIELDS):
+    """
+    Export a survey queryset as a streamed .xlsx download.
+    Returns (response, row_count).
+    """
+    writer = SurveyExcelWriter(sheet_title, fields)
+    excel_file = writer.write(iter_survey_rows(surveys, fields))
+
+    # FileResponse streams the temp file in blocks and closes (deletes) it
+    response = FileResponse(excel_file, content_type=XLSX_CONTENT_TYPE)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response, writer.row_count
+
+
+# ==============================
+# CSV / NDJSON STREAMING
+# ==============================
+class SurveyExportMixin:
+    """
+    Export parameters of the survey export views, from the request body or
+    query string: format=xlsx|csv|ndjson, the fields= column projection and
+    the delta-mode updated_since.
+    """
+
+    def perform_content_negotiation(self, request, force=False):
+        # ?format= picks the export format here, not a DRF renderer; without
+        # force DRF would answer 404 for formats it has no renderer for
+        return super().perform_content_negotiation(request, force=True)
+
+    def get_export_format(self, request):
+        """Returns (export_format, error_response)"""
+        export_format = request.data.get("format") or request.query_params.get("format") or "xlsx"
+        if export_format not in EXPORT_FORMATS:
+            return None, Response(
+                {"success": False, "message": "format must be one of: " + ", ".join(EXPORT_FORMATS)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return export_format, None
+
+    def get_export_fields(self, request):
+        """Returns (fields, error_response); all export columns by default"""
+        return get_requested_fields(request)
+
+    def get_updated_since(self, request):
+        """
+        Returns (updated_since, error_response). updated_since is an ISO 8601
+        datetime or date (midnight); naive values are in TIME_ZONE. None when
+        not given, i.e. a full export.
+        """
+        value = request.data.get("updated_since") or request.query_params.get("updated_since")
+        if not value:
+            return None, None
+
+        try:
+            updated_since = parse_datetime(value)
+            if updated_since is None:
+                since_date = parse_date(value)
+                if since_date is not None:
+                    updated_since = datetime.combine(since_date, datetime.min.time())
+        except ValueError:
+            updated_since = None
+
+        if updated_since is None:
+            return None, Response(
+                {"success": False, "message": "updated_since must be an ISO 8601 date or datetime"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if timezone.is_naive(updated_since):
+            updated_since = timezone.make_aware(updated_since)
+        return updated_since, None
+
+
+class _Echo:
+    """File-like object whose write() returns the text, for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _buffered(lines):
+    """
+    Join small pieces into STREAM_CHUNK_SIZE chunks; the first piece goes
+    out on its own so the download starts before the query returns
+    """
+    buffer = []
+    size = 0
+    started = False
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= STREAM_CHUNK_SIZE or not started:
+            started = True
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def iter_csv(surveys, fields=EXPORT_FIELDS):
+    # BOM first, so Excel opens the UTF-8 Marathi text correctly
+    yield "\ufeff"
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for row in iter_survey_values(surveys, fields):
+        yield writer.writerow([_csv_value(value) for value in row])
+
+
+def iter_ndjson(surveys, fields=EXPORT_FIELDS):
+    for row in iter_survey_values(surveys, fields):
+        yield json.dumps(dict(zip(fields, row)), cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+
+def _logged(lines, description):
+    count = 0
+    for line in lines:
+        count += 1
+        yield line
+    logger.info(f"Streamed {description}: {count} lines")
+
+
+def stream_export_response(surveys, export_format, filename, description="surveys", fields=EXPORT_FIELDS):
+    """
+    Stream surveys as CSV or NDJSON. Rows go out as the cursor yields them;
+    nothing is built up front.
+    """
+    lines = iter_csv(surveys, fields) if export_format == "csv" else iter_ndjson(surveys, fields)
+    lines = _logged(lines, f"{description} as {export_format}")
+    response = StreamingHttpResponse(_buffered(lines), content_type=EXPORT_FORMATS[export_format])
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+# ==============================
+# DELTA EXPORTS
+# ==============================
+def iter_delta_json(surveys, deleted_ids, updated_since, until, fields=EXPORT_FIELDS):
+    """
+    One JSON document: {"updated_since", "until", "surveys": [...], "deleted_ids": [...]};
+    survey rows are written as the cursor yields them
+    """
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    yield f'{{"updated_since": {encoder.encode(updated_since)}, "until": {encoder.encode(until)}, "surveys": ['
+    separator = ""
+    for row in iter_survey_values(surveys, fields):
+        yield separator + encoder.encode(dict(zip(fields, row)))
+        separator = ", "
+    yield '], "deleted_ids": ['
+    separator = ""
+    for survey_id in deleted_ids:
+        yield f"{separator}{survey_id}"
+        separator = ", "
+    yield "]}"
+
+
+def delta_export_response(surveys, deletions, updated_since, filename, description="surveys", fields=EXPORT_FIELDS):
+    """
+    Stream the surveys changed and the ids deleted after updated_since, as
+    JSON. Both are capped at "until", which the client passes as the next
+    updated_since.
+
+    updated_at / deleted_at are stamped before the transaction commits, so
+    "until" lags SURVEY_DELTA_SAFETY_LAG_SECONDS behind now: a change still
+    uncommitted while this runs is returned by a later sync instead of being
+    skipped. Only transactions open longer than the lag can be missed.
+    Changes from the last lag seconds are held back until the next sync, and
+    a survey edited again shows up again, so clients apply rows by id.
+    """
+    until = max(timezone.now() - timedelta(seconds=settings.SURVEY_DELTA_SAFETY_LAG_SECONDS), updated_since)
+    surveys = surveys.filter(updated_at__gt=updated_since, updated_at__lte=until).order_by("updated_at", "id")
+    deleted_ids = (
+        deletions.filter(deleted_at__gt=updated_since, deleted_at__lte=until)
+        .order_by("deleted_at")
+        .values_list("survey_id", flat=True)
+        .iterator(chunk_size=settings.SURVEY_EXPORT_CHUNK_SIZE)
+    )
+
+    lines = iter_delta_json(surveys, deleted_ids, updated_since, until, fields)
+    lines = _logged(lines, f"{description} changed since {updated_since.isoformat()}")
+    response = StreamingHttpResponse(_buffered(lines), content_type="application/json")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+# ==============================
+# BACKGROUND EXPORT JOBS
+# ==============================
+EXPORT_TYPES = ("all", "ward", "property_range")
+
+
+def export_queryset(export_type, ward_no=None, property_no_start=None, property_no_end=None):
+    """Surveys of an export type, filtered and ordered like the export views"""
+    surveys = Survey.objects.select_related("created_by")
+    if export_type == "all":
+        return surveys.order_by("ward_no", "property_no")
+
+    surveys = surveys.filter(ward_no=ward_no)
+    if export_type == "property_range":
+        surveys = surveys.filter(property_no__gte=property_no_start, property_no__lte=property_no_end)
+    return surveys.order_by("property_no")
+
+
+def export_scope_key(export_type, export_format, params, fields=EXPORT_FIELDS):
+    """Hash of what is exported: type, format, filter parameters and columns"""
+    payload = json.dumps(
+        {"type": export_type, "format": export_format, "params": params, "fields": list(fields)},
+        sort_keys=True,
+        cls=DjangoJSONEncoder,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def export_data_version(surveys):
+    """
+    (latest updated_at, row count) of the surveys in scope. Every save bumps
+    updated_at and a delete changes the count, so either changing means the
+    stored export is out of date. Queryset .update() calls that leave
+    updated_at alone are not seen.
+    """
+    version = surveys.order_by().aggregate(latest=Max("updated_at"), rows=Count("id"))
+    return version["latest"], version["rows"]
+
+
+def export_cache_key(scope_key, latest_updated_at, row_count):
+    latest = latest_updated_at.isoformat() if latest_updated_at else ""
+    return hashlib.sha256(f"{scope_key}:{latest}:{row_count}".encode()).hexdigest()
+
+
+def write_export_file(surveys, export_format, sheet_title, fields=EXPORT_FIELDS):
+    """
+    Write surveys to a temp file in export_format; returns
+    (file positioned at 0, row_count)
+    """
+    if export_format == "xlsx":
+        writer = SurveyExcelWriter(sheet_title, fields)
+        excel_file = writer.write(iter_survey_rows(surveys, fields))
+        return excel_file, writer.row_count
+
+    lines = iter_csv(surveys, fields) if export_format == "csv" else iter_ndjson(surveys, fields)
+    line_count = 0
+    export_file = tempfile.TemporaryFile(suffix=f".{export_format}")
+    try:
+        for line in lines:
+            export_file.write(line.encode("utf-8"))
+            line_count += 1
+    except Exception:
+        export_file.close()
+        raise
+
+    # CSV starts with the BOM and the header line; NDJSON is one line per survey
+    row_count = line_count - 2 if export_format == "csv" else line_count
+    export_file.seek(0)
+    return export_file, row_count
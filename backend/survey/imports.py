@@ -0,0 +1,415 @@
+import codecs
+import csv
+import logging
+from decimal import Decimal
+from itertools import islice
+
+import pandas as pd
+from django.conf import settings
+from django.db.models.signals import post_save
+from django.utils import timezone
+from openpyxl import load_workbook
+
+from .models import Survey
+
+logger = logging.getLogger(__name__)
+
+# Required columns of an import sheet
+REQUIRED_COLUMNS = ["ward_no", "property_no"]
+
+# insert: existing surveys are rejected; upsert: they are updated
+IMPORT_MODES = ("insert", "upsert")
+
+# A survey is identified by these columns; upserts never change them
+KEY_FIELDS = ("ward_no", "property_no")
+
+# Text columns, imported as "" when empty
+TEXT_COLUMNS = [
+    "road_name",
+    "pincode",
+    "property_description",
+    "address",
+    "address_marathi",
+    "connection_size",
+    "remarks",
+    "remarks_marathi",
+]
+
+# Text columns imported only when the cell has a value
+OPTIONAL_TEXT_COLUMNS = [
+    "property_no",
+    "old_connection_number",
+    "property_owner_name",
+    "property_owner_name_marathi",
+    "water_connection_owner_name",
+    "water_connection_owner_name_marathi",
+    "mobile_number",
+]
+
+# Whole numbers >= 0; number_of_water_connections is 0 when empty, as before
+INTEGER_COLUMNS = ["ward_no", "number_of_building", "number_of_water_connections"]
+# Largest value of the (Positive)IntegerField database columns
+MAX_INTEGER = 2147483647
+INSERT_DEFAULTS = {"number_of_water_connections": 0, **{column: "" for column in TEXT_COLUMNS}}
+
+DECIMAL_COLUMNS = ["pending_tax", "current_tax", "total_tax"]
+
+# Choice columns accept the stored value or its label (e.g. "Residential")
+CHOICE_COLUMNS = ["property_type", "connection_type"]
+
+IMPORT_COLUMNS = TEXT_COLUMNS + OPTIONAL_TEXT_COLUMNS + INTEGER_COLUMNS + DECIMAL_COLUMNS + CHOICE_COLUMNS
+
+# Indian formats: 10 digit mobile numbers (optional +91/0 prefix), 6 digit PIN codes
+MOBILE_NUMBER_PATTERN = r"[6-9]\d{9}"
+PINCODE_PATTERN = r"\d{6}"
+
+# File types the importer reads
+IMPORT_EXTENSIONS = (".xlsx", ".csv")
+
+
+# ==============================
+# STREAMING READERS
+# ==============================
+def _header(values):
+    return [str(value).strip() if value is not None else "" for value in values]
+
+
+def _xlsx_rows(uploaded_file):
+    """
+    First sheet of a workbook in openpyxl read-only mode, which parses the
+    sheet XML as it goes instead of loading the workbook
+    """
+    workbook = load_workbook(uploaded_file, read_only=True, data_only=True)
+    try:
+        values = workbook.worksheets[0].iter_rows(values_only=True)
+        yield _header(next(values, ()))
+        yield from values
+    finally:
+        workbook.close()
+
+
+def _csv_rows(uploaded_file):
+    # utf-8-sig drops the BOM Excel writes in front of UTF-8 CSV
+    reader = csv.reader(codecs.iterdecode(uploaded_file, "utf-8-sig"))
+    yield _header(next(reader, ()))
+    for values in reader:
+        # CSV has no empty cells, only empty strings
+        yield [value if value != "" else None for value in values]
+
+
+def read_import_rows(uploaded_file):
+    """
+    Open an uploaded .xlsx or .csv file. Returns (columns, rows): rows is a
+    generator of (row_number, {column: value}) with row_number as shown in
+    the sheet; empty rows are skipped. Nothing is read ahead, so memory
+    does not depend on the file size.
+    """
+    if uploaded_file.name.lower().endswith(".csv"):
+        values = _csv_rows(uploaded_file)
+    else:
+        values = _xlsx_rows(uploaded_file)
+
+    columns = next(values)
+
+    def rows():
+        # Data starts below the header row
+        for row_number, row_values in enumerate(values, start=2):
+            if all(value is None for value in row_values):
+                continue
+            yield row_number, dict(zip(columns, row_values))
+
+    return columns, rows()
+
+
+def chunked(rows, size=None):
+    """Lists of up to size (SURVEY_IMPORT_CHUNK_SIZE) items"""
+    size = size or settings.SURVEY_IMPORT_CHUNK_SIZE
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ==============================
+# IMPORT ENGINE
+# ==============================
+def _text(values):
+    """Cells as stripped text, NA when empty; whole-number floats lose Excel's .0"""
+    def to_text(value):
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value).strip()
+
+    text = values.map(to_text, na_action="ignore").astype(object)
+    return text.mask(text == "")
+
+
+def _mismatches(text, pattern):
+    """Cells with a value that does not match pattern"""
+    return text.notna() & ~text.str.fullmatch(pattern).fillna(False).astype(bool)
+
+
+def validate_rows(rows):
+    """
+    Normalize and validate a chunk of (row_number, row) pairs column by
+    column on a DataFrame, before any database work.
+
+    Returns (records, errors): records are (row_number, survey_data) of the
+    valid rows, survey_data holding only the columns with a value; errors
+    are (row_number, "Row <n>: ...") with one message per invalid row.
+    """
+    row_numbers = [row_number for row_number, _ in rows]
+    sheet = pd.DataFrame.from_records([row for _, row in rows], index=row_numbers)
+    sheet = sheet.reindex(columns=IMPORT_COLUMNS)
+
+    frame = pd.DataFrame(index=sheet.index)
+    problems = []  # (invalid rows mask, message)
+
+    for column in TEXT_COLUMNS + OPTIONAL_TEXT_COLUMNS:
+        frame[column] = _text(sheet[column])
+        max_length = Survey._meta.get_field(column).max_length
+        # Mobile numbers and pincodes are checked against their format below
+        if max_length and column not in ("mobile_number", "pincode"):
+            problems.append(
+                (frame[column].str.len() > max_length, f"{column}: Ensure this field has no more than {max_length} characters")
+            )
+
+    mobile_numbers = frame["mobile_number"].str.replace(r"[\s-]", "", regex=True)
+    frame["mobile_number"] = mobile_numbers.str.replace(r"^(\+91|91|0)(?=\d{10}$)", "", regex=True)
+    problems.append((_mismatches(frame["mobile_number"], MOBILE_NUMBER_PATTERN), "mobile_number: Enter a valid 10 digit mobile number"))
+    problems.append((_mismatches(frame["pincode"], PINCODE_PATTERN), "pincode: Enter a valid 6 digit pincode"))
+
+    for column in INTEGER_COLUMNS:
+        text = _text(sheet[column])
+        numbers = pd.to_numeric(text, errors="coerce")
+        invalid = text.notna() & (numbers.isna() | (numbers % 1 != 0) | (numbers < 0) | (numbers > MAX_INTEGER))
+        problems.append((invalid, f"{column}: A valid whole number is required"))
+        frame[column] = numbers.mask(invalid).astype("Int64")
+
+    for column in DECIMAL_COLUMNS:
+        text = _text(sheet[column])
+        numbers = pd.to_numeric(text, errors="coerce")
+        # max_digits 12, decimal_places 2
+        invalid = text.notna() & (numbers.isna() | (numbers.abs() >= 10**10))
+        problems.append((invalid, f"{column}: A valid number is required"))
+        frame[column] = numbers.mask(invalid).round(2)
+
+    for column in CHOICE_COLUMNS:
+        choices = Survey._meta.get_field(column).choices
+        labels = {str(label): value for value, label in choices}
+        text = _text(sheet[column]).replace(labels)
+        invalid = text.notna() & ~text.isin([value for value, _ in choices])
+        problems.append((invalid, f"{column}: Select one of {', '.join(value for value, _ in choices)}"))
+        frame[column] = text
+
+    messages = {}
+    for invalid, message in problems:
+        for row_number in frame.index[invalid.fillna(False).astype(bool)]:
+            messages.setdefault(row_number, []).append(message)
+
+    # Same "Row <n>: Ward <w>, Property <p> - ..." form as the duplicate check
+    ward_labels = _text(sheet["ward_no"])
+    labels = ward_labels.where(ward_labels.notna(), None)
+    property_nos = frame["property_no"].astype(object).where(frame["property_no"].notna(), None)
+    errors = [
+        (
+            row_number,
+            f"Row {row_number}: Ward {labels[row_number]}, Property {property_nos[row_number]} - "
+            + "; ".join(messages[row_number]),
+        )
+        for row_number in sorted(messages)
+    ]
+
+    records = []
+    valid = frame.drop(index=list(messages))
+    for row_number, record in zip(valid.index, valid.astype(object).to_dict("records")):
+        survey_data = {}
+        for column, value in record.items():
+            if pd.isna(value):
+                continue
+            if column in DECIMAL_COLUMNS:
+                value = Decimal(f"{value:.2f}")
+            elif column in INTEGER_COLUMNS:
+                value = int(value)
+            survey_data[column] = value
+        records.append((row_number, survey_data))
+    return records, errors
+
+
+class SurveyImporter:
+    """
+    Set-based survey import.
+
+    Each chunk of rows is first validated column-wise (validate_rows); only
+    the valid rows go on. The existing surveys with their (ward_no,
+    property_no) keys are fetched in one query and the new surveys are
+    written with bulk_create in SURVEY_IMPORT_BATCH_SIZE batches. Errors are
+    collected per row, as "Row <n>: ..." with n the spreadsheet row number.
+
+    mode "insert" rejects rows of existing surveys. mode "upsert" updates
+    them instead, with bulk_update: only the columns with a value in the
+    sheet are compared, and surveys without a difference are not written.
+    Each row's result (inserted/updated/unchanged) is kept in results.
+    """
+
+    def __init__(self, user, mode="insert", batch_size=None):
+        self.user = user
+        self.mode = mode
+        self.batch_size = batch_size or settings.SURVEY_IMPORT_BATCH_SIZE
+        self.inserted_count = 0
+        self.updated_count = 0
+        self.unchanged_count = 0
+        self.error_count = 0
+        self.errors = []
+        self.results = []
+
+    @property
+    def success_count(self):
+        return self.inserted_count + self.updated_count + self.unchanged_count
+
+    def add_error(self, message):
+        self.error_count += 1
+        self.errors.append(message)
+
+    def add_result(self, row_number, survey_data, result, changed_fields=None):
+        if self.mode == "upsert":
+            self.results.append(
+                {
+                    "row": row_number,
+                    "ward_no": survey_data.get("ward_no"),
+                    "property_no": survey_data.get("property_no"),
+                    "result": result,
+                    "changed_fields": changed_fields or [],
+                }
+            )
+
+    def import_chunk(self, rows):
+        """Import (row_number, row) pairs; returns (created, updated) surveys"""
+        records, errors = validate_rows(rows)
+
+        existing_surveys = self.existing_surveys(survey_data for _, survey_data in records)
+        seen_keys = set()
+
+        new_surveys = []
+        changed_surveys = []
+        changed_fields = set()
+        for row_number, survey_data in records:
+            ward_no = survey_data.get("ward_no")
+            property_no = survey_data.get("property_no")
+            key = (ward_no, property_no)
+
+            # Duplicate check, against the database and earlier rows of the file
+            if key in seen_keys or (self.mode == "insert" and key in existing_surveys):
+                message = "Survey already exists" if self.mode == "insert" else "Property is repeated in the file"
+                errors.append((row_number, f"Row {row_number}: Ward {ward_no}, Property {property_no} - {message}"))
+                continue
+
+            # NULL keys are never duplicates, as in the database
+            if None not in key:
+                seen_keys.add(key)
+
+            survey = existing_surveys.get(key)
+            if survey is None:
+                survey = Survey(**{**INSERT_DEFAULTS, **survey_data}, created_by=self.user)
+                new_surveys.append((row_number, survey_data, survey))
+                continue
+
+            # survey_data only has the cells with a value: empty cells keep the stored value
+            changes = {
+                field: value
+                for field, value in survey_data.items()
+                if field not in KEY_FIELDS and getattr(survey, field) != value
+            }
+            if not changes:
+                self.unchanged_count += 1
+                self.add_result(row_number, survey_data, "unchanged")
+                continue
+
+            for field, value in changes.items():
+                setattr(survey, field, value)
+            changed_surveys.append(survey)
+            changed_fields.update(changes)
+            self.updated_count += 1
+            self.add_result(row_number, survey_data, "updated", sorted(changes))
+
+        for _, message in sorted(errors):
+            self.add_error(message)
+
+        created = Survey.objects.bulk_create([survey for _, _, survey in new_surveys], batch_size=self.batch_size)
+        self.inserted_count += len(created)
+        for row_number, survey_data, _ in new_surveys:
+            self.add_result(row_number, survey_data, "inserted")
+
+        if changed_surveys:
+            # bulk_update skips auto_now: set updated_at, which delta and
+            # cached exports rely on
+            now = timezone.now()
+            for survey in changed_surveys:
+                survey.updated_at = now
+            Survey.objects.bulk_update(
+                changed_surveys, sorted(changed_fields | {"updated_at"}), batch_size=self.batch_size
+            )
+
+        # Bulk writes send no post_save; send it so the photo derivative and
+        # report pre-generation receivers still see the new and changed surveys
+        for survey in created:
+            post_save.send(sender=Survey, instance=survey, created=True, update_fields=None, raw=False)
+        for survey in changed_surveys:
+            post_save.send(sender=Survey, instance=survey, created=False, update_fields=None, raw=False)
+
+        logger.info(
+            f"Imported chunk: {len(created)} inserted, {len(changed_surveys)} updated, "
+            f"{self.error_count} errors so far"
+        )
+        return created, changed_surveys
+
+    def existing_surveys(self, survey_data_rows):
+        """{(ward_no, property_no): survey} of the rows that are already in the database"""
+        keys = {
+            (survey_data["ward_no"], survey_data["property_no"])
+            for survey_data in survey_data_rows
+            if survey_data.get("ward_no") is not None and survey_data.get("property_no") is not None
+        }
+        if not keys:
+            return {}
+
+        wards = {ward_no for ward_no, _ in keys}
+        property_nos = {property_no for _, property_no in keys}
+        candidates = Survey.objects.filter(ward_no__in=wards, property_no__in=property_nos)
+        if self.mode == "insert":
+            # Only the keys are needed to reject existing surveys
+            candidates = candidates.only("id", *KEY_FIELDS)
+        return {
+            (survey.ward_no, survey.property_no): survey
+            for survey in candidates
+            if (survey.ward_no, survey.property_no) in keys
+        }
+
+    def summary(self):
+        if self.mode == "upsert":
+            message = (
+                f"Import completed: {self.inserted_count} inserted, {self.updated_count} updated, "
+                f"{self.unchanged_count} unchanged, {self.error_count} errors"
+            )
+        else:
+            message = f"Import completed: {self.success_count} successful, {self.error_count} errors"
+
+        summary = {
+            "success": True,
+            "message": message,
+            "success_count": self.success_count,
+            "error_count": self.error_count,
+            "errors": self.errors[:10] if self.errors else [],
+        }
+        if self.mode == "upsert":
+            summary.update(
+                {
+                    "inserted_count": self.inserted_count,
+                    "updated_count": self.updated_count,
+                    "unchanged_count": self.unchanged_count,
+                    "rows": sorted(self.results, key=lambda result: result["row"]),
+                }
+            )
+        return summary
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from survey.models import Survey
+from survey.photos import build_photo_derivatives, derivatives_are_current
+
+
+class Command(BaseCommand):
+    help = "Build report-size and thumbnail copies of connection photos uploaded before derivatives existed"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ward", type=int, help="Only this ward. Default: all wards")
+        parser.add_argument(
+            "--force", action="store_true",
+            help="Rebuild derivatives even when they are up to date",
+        )
+
+    def handle(self, *args, **options):
+        surveys = Survey.objects.exclude(connection_photo="").exclude(connection_photo__isnull=True)
+        if options["ward"]:
+            surveys = surveys.filter(ward_no=options["ward"])
+
+        built = skipped = failed = 0
+        for survey in surveys.order_by("ward_no", "property_no").iterator():
+            if not options["force"] and derivatives_are_current(survey):
+                skipped += 1
+                continue
+            try:
+                build_photo_derivatives(survey)
+                built += 1
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"Survey {survey.id}: {str(e)}")
+
+        self.stdout.write(self.style.SUCCESS(f"Built {built}, skipped {skipped}, failed {failed}"))
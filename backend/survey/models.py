@@ -1,3 +1,4 @@
+import uuid
 from django.db import models
 from accounts.models import UserMaster 
 
@@ -70,6 +71,11 @@ class Survey(models.Model):
     
     # 15. Connection Photo
     connection_photo = models.ImageField(upload_to='connection_photos/', blank=True, null=True)
+    # Resized, EXIF-oriented copies built in the background from connection_photo
+    connection_photo_report = models.ImageField(upload_to='connection_photos/report/', blank=True, null=True, editable=False)
+    connection_photo_thumbnail = models.ImageField(upload_to='connection_photos/thumbnails/', blank=True, null=True, editable=False)
+    # connection_photo name the derivatives were built from
+    connection_photo_source = models.CharField(max_length=255, blank=True, null=True, editable=False)
     
     # 16. Remarks
     remarks = models.TextField(blank=True, null=True)
@@ -79,6 +85,8 @@ class Survey(models.Model):
     pincode = models.CharField(max_length=10, blank=True, null=True)
     
     pdfreport = models.FileField(upload_to='reports/', blank=True, null=True)
+    # Cache key (survey data + report version) the stored pdfreport was rendered from
+    pdfreport_key = models.CharField(max_length=64, blank=True, null=True, editable=False)
 
     # Timestamps
     created_by = models.ForeignKey(UserMaster, on_delete=models.CASCADE)
@@ -88,6 +96,138 @@ class Survey(models.Model):
     class Meta:
         ordering = ['-created_at']
         unique_together = ('ward_no', 'property_no')
+        indexes = [
+            # Delta exports: surveys changed since a timestamp, overall or per ward
+            models.Index(fields=['updated_at']),
+            models.Index(fields=['ward_no', 'updated_at']),
+        ]
     
     def __str__(self):
         return f"Survey - Ward {self.ward_no}, Property {self.property_no}"
+
+
+class SurveyDeletion(models.Model):
+    """A deleted survey, so delta exports can report its id"""
+
+    survey_id = models.PositiveIntegerField()
+    ward_no = models.PositiveIntegerField(blank=True, null=True)
+    property_no = models.CharField(max_length=50, blank=True, null=True)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['deleted_at']
+        indexes = [
+            models.Index(fields=['deleted_at']),
+            models.Index(fields=['ward_no', 'deleted_at']),
+        ]
+
+    def __str__(self):
+        return f"Deleted survey {self.survey_id} - Ward {self.ward_no}, Property {self.property_no}"
+
+
+class SurveyExportJob(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    # Request parameters
+    export_type = models.CharField(
+        max_length=20,
+        choices=[
+            ('all', 'All Surveys'),
+            ('ward', 'Ward-wise'),
+            ('property_range', 'Property Range'),
+        ],
+    )
+    export_format = models.CharField(max_length=10, default='xlsx')
+    ward_no = models.PositiveIntegerField(blank=True, null=True)
+    property_no_start = models.CharField(max_length=50, blank=True, null=True)
+    property_no_end = models.CharField(max_length=50, blank=True, null=True)
+    fields = models.JSONField(default=list, blank=True)
+
+    # Same type/format/filters/fields -> same scope_key; cache_key adds the data version
+    scope_key = models.CharField(max_length=64, db_index=True)
+    cache_key = models.CharField(max_length=64, db_index=True)
+    data_updated_at = models.DateTimeField(blank=True, null=True)
+
+    # Progress
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            (STATUS_PENDING, 'Pending'),
+            (STATUS_RUNNING, 'Running'),
+            (STATUS_COMPLETED, 'Completed'),
+            (STATUS_FAILED, 'Failed'),
+        ],
+        default=STATUS_PENDING,
+    )
+    row_count = models.PositiveIntegerField(default=0)
+    message = models.TextField(blank=True, null=True)
+
+    # Export file
+    artifact = models.FileField(upload_to='survey_exports/', blank=True, null=True)
+
+    created_by = models.ForeignKey(UserMaster, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def has_artifact(self):
+        return bool(self.artifact) and self.artifact.storage.exists(self.artifact.name)
+
+    def __str__(self):
+        return f"Survey export job {self.id} - {self.export_type} ({self.status})"
+
+
+class SurveyImportJob(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    # Uploaded sheet, kept until the import completes
+    source_file = models.FileField(upload_to='survey_imports/', blank=True, null=True)
+    original_name = models.CharField(max_length=255)
+    # insert: existing surveys are rejected; upsert: they are updated
+    mode = models.CharField(max_length=10, default='insert')
+
+    # Progress
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            (STATUS_PENDING, 'Pending'),
+            (STATUS_RUNNING, 'Running'),
+            (STATUS_COMPLETED, 'Completed'),
+            (STATUS_FAILED, 'Failed'),
+        ],
+        default=STATUS_PENDING,
+    )
+    rows_processed = models.PositiveIntegerField(default=0)
+    rows_inserted = models.PositiveIntegerField(default=0)
+    rows_updated = models.PositiveIntegerField(default=0)
+    rows_unchanged = models.PositiveIntegerField(default=0)
+    rows_rejected = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    message = models.TextField(blank=True, null=True)
+    # Sheet row number of the last row of the last committed chunk; a resumed
+    # job starts after it
+    last_committed_row = models.PositiveIntegerField(default=0)
+
+    created_by = models.ForeignKey(UserMaster, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Survey import job {self.id} - {self.original_name} ({self.status})"
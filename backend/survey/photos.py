@@ -0,0 +1,94 @@
+import io
+import logging
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_FIELDS = ["connection_photo_report", "connection_photo_thumbnail", "connection_photo_source"]
+# Columns derivatives_are_current reads
+PHOTO_FIELDS = ["connection_photo", *DERIVATIVE_FIELDS]
+
+
+# ==================== IMAGE PROCESSING ====================
+def make_derivative(image, max_size):
+    """Downscale an oriented RGB image to fit max_size and encode it as JPEG"""
+    derivative = image.copy()
+    derivative.thumbnail((max_size, max_size), Image.LANCZOS)
+
+    buffer = io.BytesIO()
+    derivative.save(
+        buffer,
+        format="JPEG",
+        quality=settings.SURVEY_PHOTO_JPEG_QUALITY,
+        optimize=True,
+        progressive=True,
+    )
+    return buffer.getvalue()
+
+
+def load_oriented_image(photo_field):
+    """Open an uploaded photo with EXIF orientation applied, as RGB"""
+    with photo_field.open("rb") as photo_file:
+        image = Image.open(photo_file)
+        # Phones store rotation in EXIF; bake it in, the JPEGs we write carry no EXIF
+        image = ImageOps.exif_transpose(image)
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        image.load()
+    return image
+
+
+def derivatives_are_current(survey):
+    """True when the derivatives were built from the current connection_photo"""
+    if not survey.connection_photo:
+        return not survey.connection_photo_report and not survey.connection_photo_thumbnail
+    return (
+        survey.connection_photo_source == survey.connection_photo.name
+        and bool(survey.connection_photo_report)
+        and bool(survey.connection_photo_thumbnail)
+    )
+
+
+# ==================== DERIVATIVE PIPELINE ====================
+def build_photo_derivatives(survey):
+    """
+    Build the report-size and thumbnail JPEGs for survey.connection_photo,
+    replacing any previous ones, and save only the derivative fields.
+    Clears the derivatives when the photo was removed.
+
+    The previous files are deleted only once the row points at the new
+    ones, so a photo that cannot be processed leaves them in place.
+    """
+    old_files = [
+        (old_file.storage, old_file.name)
+        for old_file in (survey.connection_photo_report, survey.connection_photo_thumbnail)
+        if old_file
+    ]
+
+    if survey.connection_photo:
+        image = load_oriented_image(survey.connection_photo)
+        report_jpeg = make_derivative(image, settings.SURVEY_PHOTO_REPORT_SIZE)
+        thumbnail_jpeg = make_derivative(image, settings.SURVEY_PHOTO_THUMBNAIL_SIZE)
+        image.close()
+
+        base_name = os.path.splitext(os.path.basename(survey.connection_photo.name))[0]
+        survey.connection_photo_report.save(f"{base_name}.jpg", ContentFile(report_jpeg), save=False)
+        survey.connection_photo_thumbnail.save(f"{base_name}.jpg", ContentFile(thumbnail_jpeg), save=False)
+        survey.connection_photo_source = survey.connection_photo.name
+    else:
+        survey.connection_photo_report = None
+        survey.connection_photo_thumbnail = None
+        survey.connection_photo_source = None
+
+    survey.save(update_fields=DERIVATIVE_FIELDS)
+
+    current_names = {survey.connection_photo_report.name, survey.connection_photo_thumbnail.name}
+    for storage, name in old_files:
+        if name not in current_names:
+            storage.delete(name)
+
+    logger.info(f"Built connection photo derivatives for survey {survey.id}")
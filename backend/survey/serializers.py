@@ -1,8 +1,20 @@
 from rest_framework import serializers
 from .models import Survey
+from .photos import derivatives_are_current
 
 
-class SurveySerializer(serializers.ModelSerializer):
+class FieldsProjectionMixin:
+    """Serializer option fields=[...]: only those fields are output"""
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SurveySerializer(FieldsProjectionMixin, serializers.ModelSerializer):
     created_by = serializers.CharField(source='created_by.email', read_only=True)
 
     class Meta:
@@ -23,8 +35,9 @@ class SurveySerializer(serializers.ModelSerializer):
         return instance
 
 
-class SurveyMiniSerializer(serializers.ModelSerializer):
+class SurveyMiniSerializer(FieldsProjectionMixin, serializers.ModelSerializer):
     created_by = serializers.CharField(source='created_by.email', read_only=True)
+    connection_photo_thumbnail = serializers.SerializerMethodField()
 
     class Meta:
         model = Survey
@@ -33,6 +46,18 @@ class SurveyMiniSerializer(serializers.ModelSerializer):
             'ward_no',
             'property_no',
             'property_owner_name',
+            'connection_photo_thumbnail',
             'created_by',
             'created_at',
-        ]
\ No newline at end of file
+        ]
+
+    def get_connection_photo_thumbnail(self, obj):
+        """
+        The thumbnail when it was built from the current photo; otherwise the
+        photo itself (replaced or not resized yet), or None without a photo
+        """
+        photo = obj.connection_photo_thumbnail if derivatives_are_current(obj) else obj.connection_photo
+        if not photo:
+            return None
+        request = self.context.get("request")
+        return request.build_absolute_uri(photo.url) if request else photo.url
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .models import Survey, SurveyDeletion
+from .photos import DERIVATIVE_FIELDS, derivatives_are_current
+from .tasks import generate_photo_derivatives_task
+
+
+@receiver(post_save, sender=Survey)
+def queue_photo_derivatives(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Resize a newly uploaded connection photo in the background"""
+    if raw or not settings.SURVEY_PHOTO_DERIVATIVES_ON_SAVE:
+        return
+
+    # Saving the derivatives themselves
+    if update_fields and set(update_fields) <= set(DERIVATIVE_FIELDS):
+        return
+
+    if derivatives_are_current(instance):
+        return
+
+    survey_id = instance.pk
+    transaction.on_commit(lambda: generate_photo_derivatives_task.delay(survey_id))
+
+
+@receiver(post_delete, sender=Survey)
+def record_survey_deletion(sender, instance, **kwargs):
+    """Remember the deleted id for delta exports"""
+    SurveyDeletion.objects.create(
+        survey_id=instance.pk,
+        ward_no=instance.ward_no,
+        property_no=instance.property_no,
+    )
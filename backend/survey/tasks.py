@@ -0,0 +1,194 @@
+from celery import shared_task
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def generate_photo_derivatives_task(self, survey_id):
+    """Build the report-size and thumbnail copies of a survey's connection photo"""
+    from .models import Survey
+    from .photos import build_photo_derivatives, derivatives_are_current
+
+    try:
+        survey = Survey.objects.get(pk=survey_id)
+    except Survey.DoesNotExist:
+        return f"Survey {survey_id} no longer exists"
+
+    if derivatives_are_current(survey):
+        return f"Survey {survey_id} photo derivatives already up to date"
+
+    try:
+        build_photo_derivatives(survey)
+        return f"Photo derivatives built for survey {survey_id}"
+
+    except OSError as exc:
+        # Missing or unreadable upload; retrying will not help
+        logger.error(f"Cannot build photo derivatives for survey {survey_id}: {str(exc)}")
+        return f"Photo derivatives failed for survey {survey_id}: {str(exc)}"
+
+    except Exception as exc:
+        logger.error(f"Photo derivative task failed for survey {survey_id}: {str(exc)}")
+        raise self.retry(exc=exc)
+
+
+@shared_task(bind=True)
+def generate_survey_export_task(self, job_id):
+    """Write a survey export to a stored file and mark the job completed"""
+    from .models import SurveyExportJob
+    from .exports import EXPORT_FIELDS, export_queryset, write_export_file
+
+    try:
+        job = SurveyExportJob.objects.get(pk=job_id)
+    except SurveyExportJob.DoesNotExist:
+        logger.error(f"Survey export job {job_id} not found")
+        return f"Survey export job {job_id} not found"
+
+    try:
+        job.status = SurveyExportJob.STATUS_RUNNING
+        job.save(update_fields=["status", "updated_at"])
+
+        surveys = export_queryset(
+            job.export_type,
+            ward_no=job.ward_no,
+            property_no_start=job.property_no_start,
+            property_no_end=job.property_no_end,
+        )
+        if job.export_type == "all":
+            name, sheet_title = "Survey_All", "All Surveys"
+        elif job.export_type == "ward":
+            name, sheet_title = f"Survey_Ward_{job.ward_no}", f"Ward {job.ward_no}"
+        else:
+            name = f"Survey_Ward_{job.ward_no}_Property_{job.property_no_start}_to_{job.property_no_end}"
+            sheet_title = f"Ward {job.ward_no}"
+        filename = f'{name}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{job.export_format}'
+
+        export_file, row_count = write_export_file(
+            surveys, job.export_format, sheet_title, job.fields or EXPORT_FIELDS
+        )
+        with export_file:
+            job.artifact.save(filename, File(export_file), save=False)
+        job.status = SurveyExportJob.STATUS_COMPLETED
+        job.row_count = row_count
+        job.message = f"{row_count} surveys exported"
+        job.completed_at = timezone.now()
+        job.save()
+
+        remove_superseded_exports(job)
+        logger.info(f"Survey export job {job.id} completed: {job.message}")
+        return job.message
+
+    except Exception as exc:
+        logger.error(f"Survey export job {job_id} failed: {str(exc)}", exc_info=True)
+        SurveyExportJob.objects.filter(pk=job_id).update(
+            status=SurveyExportJob.STATUS_FAILED,
+            message=str(exc),
+            completed_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        return f"Survey export job {job_id} failed: {str(exc)}"
+
+
+# Row error messages kept on an import job
+IMPORT_JOB_MAX_ERRORS = 100
+
+
+@shared_task(bind=True)
+def import_surveys_task(self, job_id):
+    """
+    Import an uploaded sheet chunk by chunk. Each chunk commits together
+    with the job's progress, so a failed job resumes after its last
+    committed chunk without importing any row twice.
+    """
+    from .imports import REQUIRED_COLUMNS, SurveyImporter, chunked, read_import_rows
+    from .models import SurveyImportJob
+
+    try:
+        job = SurveyImportJob.objects.get(pk=job_id)
+    except SurveyImportJob.DoesNotExist:
+        logger.error(f"Survey import job {job_id} not found")
+        return f"Survey import job {job_id} not found"
+
+    try:
+        job.status = SurveyImportJob.STATUS_RUNNING
+        job.message = None
+        job.save(update_fields=["status", "message", "updated_at"])
+
+        with job.source_file.open("rb") as source_file:
+            columns, rows = read_import_rows(source_file)
+            missing_columns = [col for col in REQUIRED_COLUMNS if col not in columns]
+            if missing_columns:
+                raise ValueError(f"Required columns missing: {', '.join(missing_columns)}")
+
+            pending_rows = (
+                (row_number, row) for row_number, row in rows if row_number > job.last_committed_row
+            )
+            for chunk in chunked(pending_rows):
+                importer = SurveyImporter(job.created_by, job.mode)
+                with transaction.atomic():
+                    importer.import_chunk(chunk)
+
+                    job.rows_inserted += importer.inserted_count
+                    job.rows_updated += importer.updated_count
+                    job.rows_unchanged += importer.unchanged_count
+                    job.rows_rejected += importer.error_count
+                    job.rows_processed += importer.success_count + importer.error_count
+                    job.errors = (job.errors + importer.errors)[:IMPORT_JOB_MAX_ERRORS]
+                    job.last_committed_row = chunk[-1][0]
+                    job.save(
+                        update_fields=[
+                            "rows_inserted",
+                            "rows_updated",
+                            "rows_unchanged",
+                            "rows_rejected",
+                            "rows_processed",
+                            "errors",
+                            "last_committed_row",
+                            "updated_at",
+                        ]
+                    )
+
+        job.source_file.delete(save=False)
+        job.status = SurveyImportJob.STATUS_COMPLETED
+        job.message = (
+            f"Import completed: {job.rows_inserted} inserted, {job.rows_updated} updated, "
+            f"{job.rows_unchanged} unchanged, {job.rows_rejected} errors"
+        )
+        job.completed_at = timezone.now()
+        job.save()
+
+        logger.info(f"Survey import job {job.id} completed: {job.message}")
+        return job.message
+
+    except Exception as exc:
+        logger.error(f"Survey import job {job_id} failed: {str(exc)}", exc_info=True)
+        SurveyImportJob.objects.filter(pk=job_id).update(
+            status=SurveyImportJob.STATUS_FAILED,
+            message=str(exc),
+            completed_at=timezone.now(),
+            updated_at=timezone.now(),
+        )
+        return f"Survey import job {job_id} failed: {str(exc)}"
+
+
+def remove_superseded_exports(job):
+    """
+    Delete the stored files of older exports of the same scope: their data
+    version is behind this one, so they will never be served again
+    """
+    from .models import SurveyExportJob
+
+    superseded = (
+        SurveyExportJob.objects.filter(scope_key=job.scope_key, created_at__lt=job.created_at)
+        .exclude(cache_key=job.cache_key)
+        .exclude(artifact__isnull=True)
+        .exclude(artifact="")
+    )
+    for old_job in superseded:
+        old_job.artifact.delete(save=False)
+        old_job.artifact = None
+        old_job.save(update_fields=["artifact", "updated_at"])
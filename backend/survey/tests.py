@@ -1,3 +1,125 @@
-from django.test import TestCase
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from accounts.models import UserMaster
+from roles.models import RoleMaster
+from usermodules.models import UserRoleModulePermission
+from .imports import validate_rows
+from .models import Survey
+
+
+class SurveyQueryCountTests(TestCase):
+    """
+    Survey read paths must load the creator in the same query as the
+    surveys: the number of queries may not grow with page or export size.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        role = RoleMaster.objects.create(role_name="Query Count Test")
+        UserRoleModulePermission.objects.create(user_role=role, module_permission="all")
+        cls.users = [
+            UserMaster.objects.create_user(
+                email=f"surveyor{index}@example.com",
+                password="test-password",
+                mobile_number=f"90000000{index:02d}",
+                first_name="Survey",
+                last_name=f"User {index}",
+                user_type=role,
+            )
+            for index in range(3)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.users[0])
+
+    def create_surveys(self, count, ward_no=1):
+        start = Survey.objects.filter(ward_no=ward_no).count()
+        # bulk_create: no post_save side effects (photo derivatives, PDFs)
+        Survey.objects.bulk_create(
+            Survey(
+                ward_no=ward_no,
+                property_no=f"{start + index + 100}",
+                property_owner_name=f"Owner {start + index}",
+                property_owner_name_marathi="मालक",
+                # Different creators, so one cached user cannot hide an N+1
+                created_by=self.users[(start + index) % len(self.users)],
+            )
+            for index in range(count)
+        )
+
+    def count_queries(self, method, url, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            if method == "post":
+                response = self.client.post(url, data, format="json")
+            else:
+                response = self.client.get(url, data)
+            self.assertEqual(response.status_code, 200, getattr(response, "data", None))
+            # Streamed exports run their queries while the body is read
+            if response.streaming:
+                b"".join(response.streaming_content)
+        return len(queries.captured_queries)
+
+    def assertQueriesConstant(self, method, url, data=None):
+        self.create_surveys(2)
+        small = self.count_queries(method, url, data)
+        self.create_surveys(8)
+        large = self.count_queries(method, url, data)
+        self.assertEqual(small, large, f"{url} ran {small} queries for 2 surveys, {large} for 10")
+
+    def test_list(self):
+        self.assertQueriesConstant("get", "/api/surveys/")
+
+    def test_mini_list(self):
+        self.assertQueriesConstant("get", "/api/surveys-mini/")
+
+    def test_detail_loads_creator_with_survey(self):
+        self.create_surveys(1)
+        survey = Survey.objects.get()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f"/api/surveys/{survey.pk}/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created_by"], survey.created_by.email)
+        user_queries = [
+            query["sql"] for query in queries.captured_queries
+            if 'FROM "accounts_usermaster"' in query["sql"]
+        ]
+        self.assertEqual(user_queries, [])
+
+    def test_export_all_xlsx(self):
+        self.assertQueriesConstant("get", "/api/export-all/")
+
+    def test_export_ward_wise_csv(self):
+        self.assertQueriesConstant("post", "/api/export-ward-wise/", {"ward_no": 1, "format": "csv"})
+
+    def test_export_property_range_xlsx(self):
+        self.assertQueriesConstant(
+            "post",
+            "/api/export-property-range/",
+            {"ward_no": 1, "property_no_start": 100, "property_no_end": 200},
+        )
+
+
+class ImportValidationTests(SimpleTestCase):
+    """Out-of-range numbers must become row errors, not database errors"""
+
+    def test_integer_out_of_range(self):
+        records, errors = validate_rows([
+            (2, {"ward_no": 1, "property_no": "1", "number_of_building": 3000000000}),
+            (3, {"ward_no": 1e20, "property_no": "2"}),
+            (4, {"ward_no": "1e20", "property_no": "3", "number_of_water_connections": 2147483647}),
+            (5, {"ward_no": 1, "property_no": "4", "number_of_water_connections": 2147483647}),
+        ])
+        self.assertEqual([row_number for row_number, _ in records], [5])
+        self.assertEqual(records[0][1]["number_of_water_connections"], 2147483647)
+        self.assertEqual([row_number for row_number, _ in errors], [2, 3, 4])
+        self.assertIn("number_of_building: A valid whole number is required", errors[0][1])
+        self.assertIn("ward_no: A valid whole number is required", errors[1][1])
+        self.assertIn("ward_no: A valid whole number is required", errors[2][1])
+
+    def test_blank_ward_label(self):
+        _, errors = validate_rows([(2, {"ward_no": "   ", "property_no": "1", "number_of_building": -1})])
+        self.assertTrue(errors[0][1].startswith("Row 2: Ward None, Property 1 - "), errors[0][1])
@@ -19,8 +19,17 @@ urlpatterns = [
     # 3. Export Property Range-wise (Pass ward_no, property_no_start, property_no_end)
     path('export-property-range/', views.SurveyExcelExportPropertyRangeView.as_view(), name='survey-export-property-range'),
 
+    # 4. Background export jobs (export_type, format and the filters above)
+    path('export-jobs/', views.SurveyExportJobCreateView.as_view(), name='survey-export-job-create'),
+    path('export-jobs/<uuid:job_id>/', views.SurveyExportJobStatusView.as_view(), name='survey-export-job-status'),
+    path('export-jobs/<uuid:job_id>/download/', views.SurveyExportJobDownloadView.as_view(), name='survey-export-job-download'),
+
     # Excel Import URL
     path('surveys/import-excel/', views.SurveyExcelImportView.as_view(), name='survey-excel-import'),
+    # Background imports: chunked commits, progress and resume
+    path('surveys/import-jobs/', views.SurveyImportJobCreateView.as_view(), name='survey-import-job-create'),
+    path('surveys/import-jobs/<uuid:job_id>/', views.SurveyImportJobStatusView.as_view(), name='survey-import-job-status'),
+    path('surveys/import-jobs/<uuid:job_id>/resume/', views.SurveyImportJobResumeView.as_view(), name='survey-import-job-resume'),
 
     # Template Download URL
     path('surveys/download-template/', views.SurveyExcelTemplateDownloadView.as_view(), name='survey-template-download'),
@@ -4,15 +4,36 @@ from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from .models import Survey
+from .models import Survey, SurveyDeletion, SurveyExportJob, SurveyImportJob
 from .serializers import SurveySerializer, SurveyMiniSerializer
-from django.http import HttpResponse
+from .exports import (
+    EXPORT_FORMATS,
+    EXPORT_TYPES,
+    SURVEY_FIELDS,
+    SurveyExportMixin,
+    delta_export_response,
+    excel_export_response,
+    export_cache_key,
+    export_data_version,
+    export_queryset,
+    export_scope_key,
+    get_requested_fields,
+    select_survey_fields,
+    stream_export_response,
+)
+from .imports import IMPORT_EXTENSIONS, IMPORT_MODES, REQUIRED_COLUMNS, SurveyImporter, chunked, read_import_rows
+from .photos import PHOTO_FIELDS
+from .tasks import generate_survey_export_task, import_surveys_task
+from django.http import HttpResponse, FileResponse
+from django.urls import reverse
+from django.utils import timezone
 from django.db.models import Q
 from rest_framework.views import APIView
 from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Font, PatternFill, Alignment
 import io
+import os
 from django.db.models.functions import TruncMonth
 from django.db.models import Count
 from datetime import datetime, timedelta
@@ -20,7 +41,6 @@ import logging
 from accounts.premissions import HasModuleAccess
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.pagination import PageNumberPagination
-import pandas as pd
 from django.db import transaction
 from django.conf import settings
 # Set up logging
@@ -100,7 +120,7 @@ class SurveyDetailView(APIView):
 
     def get_object(self, pk):
         try:
-            return Survey.objects.get(pk=pk)
+            return Survey.objects.select_related("created_by").get(pk=pk)
         except Survey.DoesNotExist:
             return None
 
@@ -175,11 +195,16 @@ class SurveyListView(APIView):
 
     def get(self, request, format=None):
         try:
-            surveys = Survey.objects.all()
+            # Optional fields= projection: only those columns are loaded and returned
+            fields, error_response = get_requested_fields(request, SURVEY_FIELDS, SURVEY_FIELDS)
+            if error_response:
+                return error_response
+
+            surveys = select_survey_fields(Survey.objects.all(), fields)
             paginator = PageNumberPagination()
             paginator.page_size = 10
             result_page = paginator.paginate_queryset(surveys, request)
-            serializer = SurveySerializer(result_page, many=True)
+            serializer = SurveySerializer(result_page, many=True, fields=fields)
 
             return paginator.get_paginated_response(serializer.data)
 
@@ -198,7 +223,7 @@ class SurveyListView(APIView):
 # 1. EXPORT ALL SURVEYS
 # ==============================
 @method_decorator(csrf_exempt, name="dispatch")
-class SurveyExcelExportAllView(APIView):
+class SurveyExcelExportAllView(SurveyExportMixin, APIView):
     """Export ALL Survey data to Excel"""
     
     permission_classes = [IsAuthenticated, HasModuleAccess]
@@ -206,8 +231,27 @@ class SurveyExcelExportAllView(APIView):
     
     def get(self, request):
         try:
+            export_format, error_response = self.get_export_format(request)
+            if error_response:
+                return error_response
+
+            fields, error_response = self.get_export_fields(request)
+            if error_response:
+                return error_response
+
+            updated_since, error_response = self.get_updated_since(request)
+            if error_response:
+                return error_response
+
             # Get all surveys
-            surveys = Survey.objects.all().order_by('ward_no', 'property_no')
+            surveys = Survey.objects.select_related('created_by').order_by('ward_no', 'property_no')
+
+            # Delta mode: only changed surveys and deleted ids, always JSON
+            if updated_since:
+                filename = f'Survey_All_Changes_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+                return delta_export_response(
+                    surveys, SurveyDeletion.objects.all(), updated_since, filename, "all surveys", fields
+                )
             
             if not surveys.exists():
                 return Response(
@@ -215,19 +259,14 @@ class SurveyExcelExportAllView(APIView):
                     status=status.HTTP_404_NOT_FOUND,
                 )
             
-            # Generate Excel file
-            excel_file = self.generate_excel(surveys)
-            
-            # Create response
-            response = HttpResponse(
-                excel_file.getvalue(),
-                content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            )
-            
-            filename = f'Survey_All_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-            response["Content-Disposition"] = f'attachment; filename="{filename}"'
+            filename = f'Survey_All_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{export_format}'
+            if export_format != "xlsx":
+                return stream_export_response(surveys, export_format, filename, "all surveys", fields)
+
+            # Stream the Excel file from the shared export engine
+            response, row_count = excel_export_response(surveys, "All Surveys", filename, fields)
             
-            logger.info(f"Exported all surveys: {surveys.count()} records")
+            logger.info(f"Exported all surveys: {row_count} records")
             return response
             
         except Exception as e:
@@ -236,98 +275,13 @@ class SurveyExcelExportAllView(APIView):
                 {"success": False, "message": f"Export error: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
-    
-    def generate_excel(self, surveys):
-        """Generate Excel file with Survey data"""
-        
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "All Surveys"
-        
-        # Headers
-        headers = [
-            "id",
-            "ward_no",
-            "property_no",
-            "old_connection_number",
-            "property_description",
-            "property_owner_name",
-            "property_owner_name_marathi",
-            "property_type",
-            "number_of_building",
-            "water_connection_owner_name",
-            "water_connection_owner_name_marathi",
-            "connection_type",
-            "connection_size",
-            "number_of_water_connections",
-            "mobile_number",
-            "pincode",
-            "address",
-            "address_marathi",
-            "pending_tax",
-            "current_tax",
-            "total_tax",
-            "remarks",
-            "remarks_marathi",
-            "created_by",
-            "created_at",
-            "updated_at",
-        ]
-        
-        ws.append(headers)
-        
-        # Helper function
-        def make_naive(dt):
-            if isinstance(dt, datetime):
-                return dt.replace(tzinfo=None)
-            return dt
-        
-        # Write data rows
-        for survey in surveys:
-            row = []
-            for fld in headers:
-                val = getattr(survey, fld, "")
-                if fld == "created_by" and val:
-                    val = val.email
-                row.append(make_naive(val))
-            ws.append(row)
-        
-        # Style headers
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        
-        for cell in ws[1]:
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-        
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        # Save Excel
-        excel_file = io.BytesIO()
-        wb.save(excel_file)
-        excel_file.seek(0)
-        
-        return excel_file
 
 
 # ==============================
 # 2. EXPORT WARD-WISE SURVEYS
 # ==============================
 @method_decorator(csrf_exempt, name="dispatch")
-class SurveyExcelExportWardWiseView(APIView):
+class SurveyExcelExportWardWiseView(SurveyExportMixin, APIView):
     """Export Survey data by Ward Number"""
     
     permission_classes = [IsAuthenticated, HasModuleAccess]
@@ -335,6 +289,18 @@ class SurveyExcelExportWardWiseView(APIView):
     
     def post(self, request):
         try:
+            export_format, error_response = self.get_export_format(request)
+            if error_response:
+                return error_response
+
+            fields, error_response = self.get_export_fields(request)
+            if error_response:
+                return error_response
+
+            updated_since, error_response = self.get_updated_since(request)
+            if error_response:
+                return error_response
+
             # Get ward number from request
             ward_no = request.data.get("ward_no")
             
@@ -354,9 +320,21 @@ class SurveyExcelExportWardWiseView(APIView):
                 )
             
             # Filter surveys by ward
-            surveys = Survey.objects.filter(
+            surveys = Survey.objects.select_related("created_by").filter(
                 ward_no=ward_number
             ).order_by('property_no')
+
+            # Delta mode: only changed surveys and deleted ids, always JSON
+            if updated_since:
+                filename = f'Survey_Ward_{ward_number}_Changes_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+                return delta_export_response(
+                    surveys,
+                    SurveyDeletion.objects.filter(ward_no=ward_number),
+                    updated_since,
+                    filename,
+                    f"Ward {ward_number} surveys",
+                    fields,
+                )
             
             if not surveys.exists():
                 return Response(
@@ -367,19 +345,14 @@ class SurveyExcelExportWardWiseView(APIView):
                     status=status.HTTP_404_NOT_FOUND,
                 )
             
-            # Generate Excel file
-            excel_file = self.generate_excel(surveys, ward_number)
-            
-            # Create response
-            response = HttpResponse(
-                excel_file.getvalue(),
-                content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            )
-            
-            filename = f'Survey_Ward_{ward_number}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-            response["Content-Disposition"] = f'attachment; filename="{filename}"'
+            filename = f'Survey_Ward_{ward_number}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{export_format}'
+            if export_format != "xlsx":
+                return stream_export_response(surveys, export_format, filename, f"Ward {ward_number} surveys", fields)
+
+            # Stream the Excel file from the shared export engine
+            response, row_count = excel_export_response(surveys, f"Ward {ward_number}", filename, fields)
             
-            logger.info(f"Exported ward-wise surveys for Ward {ward_number}: {surveys.count()} records")
+            logger.info(f"Exported ward-wise surveys for Ward {ward_number}: {row_count} records")
             return response
             
         except Exception as e:
@@ -388,98 +361,13 @@ class SurveyExcelExportWardWiseView(APIView):
                 {"success": False, "message": f"Export error: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
-    
-    def generate_excel(self, surveys, ward_number):
-        """Generate Excel file with Ward-wise Survey data"""
-        
-        wb = Workbook()
-        ws = wb.active
-        ws.title = f"Ward {ward_number}"
-        
-        # Headers
-        headers = [
-            "id",
-            "ward_no",
-            "property_no",
-            "old_connection_number",
-            "property_description",
-            "property_owner_name",
-            "property_owner_name_marathi",
-            "property_type",
-            "number_of_building",
-            "water_connection_owner_name",
-            "water_connection_owner_name_marathi",
-            "connection_type",
-            "connection_size",
-            "number_of_water_connections",
-            "mobile_number",
-            "pincode",
-            "address",
-            "address_marathi",
-            "pending_tax",
-            "current_tax",
-            "total_tax",
-            "remarks",
-            "remarks_marathi",
-            "created_by",
-            "created_at",
-            "updated_at",
-        ]
-        
-        ws.append(headers)
-        
-        # Helper function
-        def make_naive(dt):
-            if isinstance(dt, datetime):
-                return dt.replace(tzinfo=None)
-            return dt
-        
-        # Write data rows
-        for survey in surveys:
-            row = []
-            for fld in headers:
-                val = getattr(survey, fld, "")
-                if fld == "created_by" and val:
-                    val = val.email
-                row.append(make_naive(val))
-            ws.append(row)
-        
-        # Style headers
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        
-        for cell in ws[1]:
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-        
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        # Save Excel
-        excel_file = io.BytesIO()
-        wb.save(excel_file)
-        excel_file.seek(0)
-        
-        return excel_file
 
 
 # ==============================
 # 3. EXPORT PROPERTY RANGE-WISE SURVEYS
 # ==============================
 @method_decorator(csrf_exempt, name="dispatch")
-class SurveyExcelExportPropertyRangeView(APIView):
+class SurveyExcelExportPropertyRangeView(SurveyExportMixin, APIView):
     """Export Survey data by Ward and Property Range"""
     
     permission_classes = [IsAuthenticated, HasModuleAccess]
@@ -487,6 +375,18 @@ class SurveyExcelExportPropertyRangeView(APIView):
     
     def post(self, request):
         try:
+            export_format, error_response = self.get_export_format(request)
+            if error_response:
+                return error_response
+
+            fields, error_response = self.get_export_fields(request)
+            if error_response:
+                return error_response
+
+            updated_since, error_response = self.get_updated_since(request)
+            if error_response:
+                return error_response
+
             # Get parameters from request
             ward_no = request.data.get("ward_no")
             property_no_start = request.data.get("property_no_start")
@@ -525,11 +425,28 @@ class SurveyExcelExportPropertyRangeView(APIView):
                 )
             
             # Filter surveys by ward and property range
-            surveys = Survey.objects.filter(
+            surveys = Survey.objects.select_related("created_by").filter(
                 ward_no=ward_number,
                 property_no__gte=property_start,
                 property_no__lte=property_end,
             ).order_by("property_no")
+
+            # Delta mode: only changed surveys and deleted ids, always JSON
+            if updated_since:
+                deletions = SurveyDeletion.objects.filter(
+                    ward_no=ward_number,
+                    property_no__gte=property_start,
+                    property_no__lte=property_end,
+                )
+                filename = f'Survey_Ward_{ward_number}_Property_{property_start}_to_{property_end}_Changes_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+                return delta_export_response(
+                    surveys,
+                    deletions,
+                    updated_since,
+                    filename,
+                    f"Ward {ward_number}, Property {property_start}-{property_end} surveys",
+                    fields,
+                )
             
             if not surveys.exists():
                 return Response(
@@ -540,19 +457,20 @@ class SurveyExcelExportPropertyRangeView(APIView):
                     status=status.HTTP_404_NOT_FOUND,
                 )
             
-            # Generate Excel file
-            excel_file = self.generate_excel(surveys, ward_number, property_start, property_end)
-            
-            # Create response
-            response = HttpResponse(
-                excel_file.getvalue(),
-                content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            )
-            
-            filename = f'Survey_Ward_{ward_number}_Property_{property_start}_to_{property_end}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-            response["Content-Disposition"] = f'attachment; filename="{filename}"'
+            filename = f'Survey_Ward_{ward_number}_Property_{property_start}_to_{property_end}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{export_format}'
+            if export_format != "xlsx":
+                return stream_export_response(
+                    surveys,
+                    export_format,
+                    filename,
+                    f"Ward {ward_number}, Property {property_start}-{property_end} surveys",
+                    fields,
+                )
+
+            # Stream the Excel file from the shared export engine
+            response, row_count = excel_export_response(surveys, f"Ward {ward_number}", filename, fields)
             
-            logger.info(f"Exported property range surveys for Ward {ward_number}, Property {property_start}-{property_end}: {surveys.count()} records")
+            logger.info(f"Exported property range surveys for Ward {ward_number}, Property {property_start}-{property_end}: {row_count} records")
             return response
             
         except Exception as e:
@@ -561,91 +479,251 @@ class SurveyExcelExportPropertyRangeView(APIView):
                 {"success": False, "message": f"Export error: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
-    
-    def generate_excel(self, surveys, ward_number, property_start, property_end):
-        """Generate Excel file with Property Range Survey data"""
-        
-        wb = Workbook()
-        ws = wb.active
-        ws.title = f"Ward {ward_number}"
-        
-        # Headers
-        headers = [
-            "id",
-            "ward_no",
-            "property_no",
-            "old_connection_number",
-            "property_description",
-            "property_owner_name",
-            "property_owner_name_marathi",
-            "property_type",
-            "number_of_building",
-            "water_connection_owner_name",
-            "water_connection_owner_name_marathi",
-            "connection_type",
-            "connection_size",
-            "number_of_water_connections",
-            "mobile_number",
-            "pincode",
-            "address",
-            "address_marathi",
-            "pending_tax",
-            "current_tax",
-            "total_tax",
-            "remarks",
-            "remarks_marathi",
-            "created_by",
-            "created_at",
-            "updated_at",
-        ]
-        
-        ws.append(headers)
-        
-        # Helper function
-        def make_naive(dt):
-            if isinstance(dt, datetime):
-                return dt.replace(tzinfo=None)
-            return dt
-        
-        # Write data rows
-        for survey in surveys:
-            row = []
-            for fld in headers:
-                val = getattr(survey, fld, "")
-                if fld == "created_by" and val:
-                    val = val.email
-                row.append(make_naive(val))
-            ws.append(row)
-        
-        # Style headers
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        
-        for cell in ws[1]:
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-        
-        # Auto-adjust column widths
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 50)
-            ws.column_dimensions[column_letter].width = adjusted_width
-        
-        # Save Excel
-        excel_file = io.BytesIO()
-        wb.save(excel_file)
-        excel_file.seek(0)
-        
-        return excel_file
+
+
+# ==============================
+# 4. BACKGROUND EXPORT JOBS
+# ==============================
+@method_decorator(csrf_exempt, name="dispatch")
+class SurveyExportJobCreateView(SurveyExportMixin, APIView):
+    """
+    Queue a survey export as a background job. export_type is all, ward or
+    property_range, with the same parameters as the matching export view.
+
+    The stored file is keyed by export type, format, filters and the data
+    version (latest updated_at and row count in scope): an identical request
+    is answered with the existing job until a survey in scope changes.
+    """
+
+    permission_classes = [IsAuthenticated, HasModuleAccess]
+    required_permission = "export-survey"
+
+    def post(self, request):
+        try:
+            export_format, error_response = self.get_export_format(request)
+            if error_response:
+                return error_response
+
+            fields, error_response = self.get_export_fields(request)
+            if error_response:
+                return error_response
+
+            params, error_response = self.parse_export_params(request)
+            if error_response:
+                return error_response
+
+            export_type = params.pop("export_type")
+            surveys = export_queryset(export_type, **params)
+            latest_updated_at, row_count = export_data_version(surveys)
+            if not row_count:
+                return Response(
+                    {"success": False, "message": "No surveys found to export"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+
+            scope_key = export_scope_key(export_type, export_format, params, fields)
+            cache_key = export_cache_key(scope_key, latest_updated_at, row_count)
+
+            # A pending/running job older than the task time limit lost its
+            # worker; fail it so the export is queued again below
+            stalled_before = timezone.now() - timedelta(seconds=settings.CELERY_TASK_TIME_LIMIT)
+            SurveyExportJob.objects.filter(
+                cache_key=cache_key,
+                status__in=[SurveyExportJob.STATUS_PENDING, SurveyExportJob.STATUS_RUNNING],
+                updated_at__lt=stalled_before,
+            ).update(
+                status=SurveyExportJob.STATUS_FAILED,
+                message="Export job stalled and was superseded",
+                updated_at=timezone.now(),
+            )
+
+            # Same export of the same data: reuse the finished file or the running job
+            existing_job = (
+                SurveyExportJob.objects.filter(cache_key=cache_key)
+                .exclude(status=SurveyExportJob.STATUS_FAILED)
+                .first()
+            )
+            if existing_job and (
+                existing_job.status != SurveyExportJob.STATUS_COMPLETED or existing_job.has_artifact()
+            ):
+                logger.info(f"Survey export job {existing_job.id} reused for {export_type} export")
+                return self.job_response(existing_job, cached=True)
+
+            job = SurveyExportJob.objects.create(
+                export_type=export_type,
+                export_format=export_format,
+                fields=fields,
+                scope_key=scope_key,
+                cache_key=cache_key,
+                data_updated_at=latest_updated_at,
+                row_count=row_count,
+                created_by=request.user,
+                **params,
+            )
+
+            # Runs inline when CELERY_TASK_ALWAYS_EAGER is on
+            generate_survey_export_task.delay(str(job.id))
+            logger.info(f"Survey export job {job.id} queued for {export_type} export")
+
+            job.refresh_from_db()
+            return self.job_response(job, cached=False)
+
+        except Exception as e:
+            logger.error(f"Survey export job error: {str(e)}", exc_info=True)
+            return Response(
+                {"success": False, "message": f"Export job error: {str(e)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+    def parse_export_params(self, request):
+        """Returns (params, error_response); params are export_queryset() kwargs plus export_type"""
+        export_type = request.data.get("export_type") or "all"
+        if export_type not in EXPORT_TYPES:
+            return None, Response(
+                {"success": False, "message": "export_type must be one of: " + ", ".join(EXPORT_TYPES)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        params = {"export_type": export_type}
+        if export_type == "all":
+            return params, None
+
+        ward_no = request.data.get("ward_no")
+        if not ward_no:
+            return None, Response(
+                {"success": False, "message": "Ward number is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            params["ward_no"] = int(ward_no)
+        except (TypeError, ValueError):
+            return None, Response(
+                {"success": False, "message": "Please enter valid ward number"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if export_type == "property_range":
+            property_no_start = request.data.get("property_no_start")
+            property_no_end = request.data.get("property_no_end")
+            if not property_no_start or not property_no_end:
+                return None, Response(
+                    {"success": False, "message": "Property number range is required"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            try:
+                property_start = int(property_no_start)
+                property_end = int(property_no_end)
+            except (TypeError, ValueError):
+                return None, Response(
+                    {"success": False, "message": "Please enter valid numbers"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            if property_start > property_end:
+                return None, Response(
+                    {
+                        "success": False,
+                        "message": "Start property number should be less than or equal to end property number",
+                    },
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            params["property_no_start"] = property_start
+            params["property_no_end"] = property_end
+
+        return params, None
+
+    def job_response(self, job, cached):
+        ready = job.status == SurveyExportJob.STATUS_COMPLETED
+        return Response(
+            {
+                "success": True,
+                "message": "Export is ready" if ready else "Export job queued",
+                "job_id": str(job.id),
+                "status": job.status,
+                "cached": cached,
+                "status_url": reverse("surveys:survey-export-job-status", args=[job.id]),
+                "download_url": reverse("surveys:survey-export-job-download", args=[job.id]) if ready else None,
+            },
+            status=status.HTTP_200_OK if ready else status.HTTP_202_ACCEPTED,
+        )
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class SurveyExportJobStatusView(APIView):
+    """Progress of a background survey export job"""
+
+    permission_classes = [IsAuthenticated, HasModuleAccess]
+    required_permission = "export-survey"
+
+    def get(self, request, job_id):
+        try:
+            job = SurveyExportJob.objects.get(pk=job_id)
+        except SurveyExportJob.DoesNotExist:
+            return Response(
+                {"success": False, "message": "Job not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        download_url = None
+        if job.status == SurveyExportJob.STATUS_COMPLETED and job.artifact:
+            download_url = reverse("surveys:survey-export-job-download", args=[job.id])
+
+        return Response(
+            {
+                "success": True,
+                "data": {
+                    "job_id": str(job.id),
+                    "status": job.status,
+                    "export_type": job.export_type,
+                    "format": job.export_format,
+                    "fields": job.fields,
+                    "ward_no": job.ward_no,
+                    "property_no_start": job.property_no_start,
+                    "property_no_end": job.property_no_end,
+                    "row_count": job.row_count,
+                    "data_updated_at": job.data_updated_at,
+                    "message": job.message,
+                    "download_url": download_url,
+                    "created_at": job.created_at,
+                    "completed_at": job.completed_at,
+                },
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class SurveyExportJobDownloadView(APIView):
+    """Download the file of a completed survey export job"""
+
+    permission_classes = [IsAuthenticated, HasModuleAccess]
+    required_permission = "export-survey"
+
+    def get(self, request, job_id):
+        try:
+            job = SurveyExportJob.objects.get(pk=job_id)
+        except SurveyExportJob.DoesNotExist:
+            return Response(
+                {"success": False, "message": "Job not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        if job.status != SurveyExportJob.STATUS_COMPLETED:
+            return Response(
+                {"success": False, "message": f"Job is {job.status}"},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        # Files of superseded exports are removed once newer data is exported
+        if not job.has_artifact():
+            return Response(
+                {"success": False, "message": "Export is out of date, please export again"},
+                status=status.HTTP_410_GONE,
+            )
+
+        response = FileResponse(job.artifact.open("rb"), content_type=EXPORT_FORMATS[job.export_format])
+        response["Content-Disposition"] = f'attachment; filename="{os.path.basename(job.artifact.name)}"'
+        return response
+
 
 # ==============================
 # Excel Import
@@ -670,17 +748,24 @@ class SurveyExcelImportView(APIView):
             excel_file = request.FILES["excel_file"]
 
             # Extension check
-            if not excel_file.name.endswith((".xlsx", ".xls")):
+            if not excel_file.name.lower().endswith(IMPORT_EXTENSIONS):
                 return Response(
-                    {"success": False, "message": "Only Excel files (.xlsx, .xls) are allowed"},
+                    {"success": False, "message": "Only Excel (.xlsx) or CSV (.csv) files are allowed"},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
-            # Read Excel
+            # insert rejects existing surveys, upsert updates them
+            import_mode = request.data.get("mode") or "insert"
+            if import_mode not in IMPORT_MODES:
+                return Response(
+                    {"success": False, "message": "mode must be one of: " + ", ".join(IMPORT_MODES)},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            # Open the file; rows are read chunk by chunk while importing
             try:
-                df = pd.read_excel(excel_file, engine="openpyxl")
-                logger.info(f"Excel file read successfully. Columns: {df.columns.tolist()}")
-                logger.info(f"Total rows: {len(df)}")
+                columns, rows = read_import_rows(excel_file)
+                logger.info(f"Import file opened successfully. Columns: {columns}")
             except Exception as e:
                 return Response(
                     {"success": False, "message": f"Error reading Excel file: {str(e)}"},
@@ -688,7 +773,7 @@ class SurveyExcelImportView(APIView):
                 )
 
             # Process and import
-            result = self.process_excel_data(df, request)
+            result = self.process_excel_data(columns, rows, request, import_mode)
 
             return Response(result, status=status.HTTP_200_OK)
 
@@ -701,17 +786,10 @@ class SurveyExcelImportView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-    def process_excel_data(self, df, request):
-        """Process Excel data and import to database"""
-        success_count = 0
-        error_count = 0
-        errors = []
-
-        # Required columns
-        required_columns = ["ward_no", "property_no"]
-
+    def process_excel_data(self, columns, rows, request, import_mode="insert"):
+        """Import the (row_number, row) pairs of the uploaded file"""
         # Check required columns
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in columns]
         if missing_columns:
             return {
                 "success": False,
@@ -719,64 +797,160 @@ class SurveyExcelImportView(APIView):
                 "missing_columns": missing_columns,
             }
 
+        importer = SurveyImporter(request.user, import_mode)
         with transaction.atomic():
-            for index, row in df.iterrows():
-                try:
-                    ward_no = row.get("ward_no")
-                    property_no = row.get("property_no")
-
-                    # Duplicate check
-                    if Survey.objects.filter(ward_no=ward_no, property_no=property_no).exists():
-                        error_count += 1
-                        errors.append(
-                            f"Row {index+2}: Ward {ward_no}, Property {property_no} - Survey already exists"
-                        )
-                        continue
-
-                    # Prepare survey data
-                    survey_data = {
-                        "ward_no": int(ward_no) if pd.notna(ward_no) else None,
-                        "ward_name": str(row.get("ward_name", "")) if pd.notna(row.get("ward_name")) else "",
-                        "road_name": str(row.get("road_name", "")) if pd.notna(row.get("road_name")) else "",
-                        "pincode": str(row.get("pincode", "")) if pd.notna(row.get("pincode")) else "",
-                        "property_no": str(property_no) if pd.notna(property_no) else None,
-                        "old_ward_no": str(row.get("old_ward_no", "")) if pd.notna(row.get("old_ward_no")) else "",
-                        "old_property_no": str(row.get("old_property_no", "")) if pd.notna(row.get("old_property_no")) else "",
-                        "property_description": str(row.get("property_description", "")) if pd.notna(row.get("property_description")) else "",
-                        "address": str(row.get("address", "")) if pd.notna(row.get("address")) else "",
-                        "address_marathi": str(row.get("address_marathi", "")) if pd.notna(row.get("address_marathi")) else "",
-                        "water_connection_available": str(row.get("water_connection_available", "No")),
-                        "number_of_water_connections": int(row.get("number_of_water_connections", 0) or 0),
-                        "connection_size": str(row.get("connection_size", "")) if pd.notna(row.get("connection_size")) else "",
-                        "remarks": str(row.get("remarks", "")) if pd.notna(row.get("remarks")) else "",
-                        "remarks_marathi": str(row.get("remarks_marathi", "")) if pd.notna(row.get("remarks_marathi")) else "",
-                    }
-
-
-                    # Create survey
-                    survey_serializer = SurveySerializer(data=survey_data, context={"request": request})
-                    if survey_serializer.is_valid():
-                        survey_serializer.save()
-                        success_count += 1
-                        logger.info(f"Successfully imported Ward {ward_no}, Property {property_no}")
-                    else:
-                        error_count += 1
-                        errors.append(
-                            f"Row {index+2}: Ward {ward_no}, Property {property_no} - {survey_serializer.errors}"
-                        )
-
-                except Exception as e:
-                    error_count += 1
-                    errors.append(f"Row {index+2}: {str(e)}")
-                    logger.error(f"Error importing row {index+2}: {str(e)}")
-
-        return {
-            "success": True,
-            "message": f"Import completed: {success_count} successful, {error_count} errors",
-            "success_count": success_count,
-            "error_count": error_count,
-            "errors": errors[:10] if errors else [],
-        }
+            for chunk in chunked(rows):
+                importer.import_chunk(chunk)
+
+        return importer.summary()
+
+
+# ==============================
+# Background Import Jobs
+# ==============================
+def import_job_data(job):
+    return {
+        "job_id": str(job.id),
+        "status": job.status,
+        "file_name": job.original_name,
+        "mode": job.mode,
+        "rows_processed": job.rows_processed,
+        "rows_inserted": job.rows_inserted,
+        "rows_updated": job.rows_updated,
+        "rows_unchanged": job.rows_unchanged,
+        "rows_rejected": job.rows_rejected,
+        "last_committed_row": job.last_committed_row,
+        "errors": job.errors[:10],
+        "message": job.message,
+        "status_url": reverse("surveys:survey-import-job-status", args=[job.id]),
+        "created_at": job.created_at,
+        "completed_at": job.completed_at,
+    }
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class SurveyImportJobCreateView(APIView):
+    """
+    Queue an Excel/CSV import (mode=insert|upsert) as a background job.
+    Rows are committed chunk by chunk; progress is read from the status
+    endpoint.
+    """
+
+    permission_classes = [IsAuthenticated, HasModuleAccess]
+    required_permission = "import-survey"
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request):
+        try:
+            if "excel_file" not in request.FILES:
+                return Response(
+                    {"success": False, "message": "Excel file is required"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            excel_file = request.FILES["excel_file"]
+            if not excel_file.name.lower().endswith(IMPORT_EXTENSIONS):
+                return Response(
+                    {"success": False, "message": "Only Excel (.xlsx) or CSV (.csv) files are allowed"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            import_mode = request.data.get("mode") or "insert"
+            if import_mode not in IMPORT_MODES:
+                return Response(
+                    {"success": False, "message": "mode must be one of: " + ", ".join(IMPORT_MODES)},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            job = SurveyImportJob(original_name=excel_file.name, mode=import_mode, created_by=request.user)
+            job.source_file.save(os.path.basename(excel_file.name), excel_file, save=False)
+            job.save()
+
+            # Runs inline when CELERY_TASK_ALWAYS_EAGER is on
+            import_surveys_task.delay(str(job.id))
+            logger.info(f"Survey import job {job.id} queued for {job.original_name}")
+
+            job.refresh_from_db()
+            return Response(
+                {"success": True, "message": "Import job queued", "data": import_job_data(job)},
+                status=status.HTTP_202_ACCEPTED,
+            )
+
+        except Exception as e:
+            logger.error(f"Survey import job error: {str(e)}", exc_info=True)
+            return Response(
+                {"success": False, "message": f"Import job error: {str(e)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class SurveyImportJobStatusView(APIView):
+    """Progress of a background survey import job"""
+
+    permission_classes = [IsAuthenticated, HasModuleAccess]
+    required_permission = "import-survey"
+
+    def get(self, request, job_id):
+        try:
+            job = SurveyImportJob.objects.get(pk=job_id)
+        except SurveyImportJob.DoesNotExist:
+            return Response(
+                {"success": False, "message": "Job not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return Response({"success": True, "data": import_job_data(job)}, status=status.HTTP_200_OK)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class SurveyImportJobResumeView(APIView):
+    """
+    Restart a failed import job after its last committed chunk. A job still
+    marked running after CELERY_TASK_TIME_LIMIT without progress lost its
+    worker and may be resumed too.
+    """
+
+    permission_classes = [IsAuthenticated, HasModuleAccess]
+    required_permission = "import-survey"
+
+    def post(self, request, job_id):
+        try:
+            job = SurveyImportJob.objects.get(pk=job_id)
+        except SurveyImportJob.DoesNotExist:
+            return Response(
+                {"success": False, "message": "Job not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        stalled = (
+            job.status == SurveyImportJob.STATUS_RUNNING
+            and job.updated_at < timezone.now() - timedelta(seconds=settings.CELERY_TASK_TIME_LIMIT)
+        )
+        if job.status != SurveyImportJob.STATUS_FAILED and not stalled:
+            return Response(
+                {"success": False, "message": f"Job is {job.status}"},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        if not job.source_file or not job.source_file.storage.exists(job.source_file.name):
+            return Response(
+                {"success": False, "message": "Import file is no longer available, please upload it again"},
+                status=status.HTTP_410_GONE,
+            )
+
+        job.status = SurveyImportJob.STATUS_PENDING
+        job.completed_at = None
+        job.save(update_fields=["status", "completed_at", "updated_at"])
+
+        import_surveys_task.delay(str(job.id))
+        logger.info(f"Survey import job {job.id} resumed after row {job.last_committed_row}")
+
+        job.refresh_from_db()
+        return Response(
+            {"success": True, "message": "Import job resumed", "data": import_job_data(job)},
+            status=status.HTTP_202_ACCEPTED,
+        )
 
 
 # ==============================
@@ -838,7 +1012,7 @@ class SurveyExcelTemplateDownloadView(APIView):
                 1,                       
                 "Rahul Patil",           
                 "राहुल पाटील",          
-                "Yes",          
+                "अधिकृत",
                 "15mm",                   
                 1,                         
                 "9876543210",              
@@ -1057,7 +1231,16 @@ class SurveyMiniListViewAPIView(APIView):
 
     def get(self, request, format=None):
         try:
-            qs = Survey.objects.all().order_by('-created_at')
+            # Optional fields= projection within the mini list's own fields
+            fields, error_response = get_requested_fields(
+                request, SurveyMiniSerializer.Meta.fields, SurveyMiniSerializer.Meta.fields
+            )
+            if error_response:
+                return error_response
+
+            # The thumbnail is checked against the photo it was built from
+            model_fields = fields + PHOTO_FIELDS if "connection_photo_thumbnail" in fields else fields
+            qs = select_survey_fields(Survey.objects.all(), model_fields).order_by('-created_at')
             
             # ✅ ADD FILTERS
             ward_no = request.query_params.get('ward_no')
@@ -1074,7 +1257,7 @@ class SurveyMiniListViewAPIView(APIView):
             paginator = PageNumberPagination()
             paginator.page_size = 10
             page = paginator.paginate_queryset(qs, request)
-            serializer = SurveyMiniSerializer(page, many=True)
+            serializer = SurveyMiniSerializer(page, many=True, fields=fields)
             return paginator.get_paginated_response(serializer.data)
         except Exception as e:
             return Response({